@@ -0,0 +1,224 @@
+"""Team form features computed from saved fixture files.
+
+Every (file, team) pair is a group: the H2H matches of a fixture file give a
+group for each of its two teams, and a recent-matches file (the
+save_to_json.py layout) a group for its team. All matches of all groups are
+laid out in flat arrays and every feature is computed for every group at
+once with np.bincount, so a whole round costs a handful of array operations.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import numpy as np
+from checkpoint import file_hash
+from export import fixture_files
+from match_stats import STAT_DTYPES, MatchStats
+from output_writer import write_json_atomic
+
+# Default location of the per-file feature cache
+FEATURE_CACHE_PATH = os.path.join("cache", "features.json")
+# Weight of a match relative to the next more recent one in the exponentially weighted form
+FORM_DECAY = 0.7
+# Total goals lines of the over/under rates
+GOAL_LINES = (1.5, 2.5, 3.5)
+# Part of every cache key; bumped when the rows computed for a file change
+FEATURES_VERSION = 2
+
+# Country suffix some H2H rows add to team names, e.g. "Arsenal (Eng)"
+TEAM_SUFFIX_PATTERN = re.compile(r"\s*\([^)]*\)$")
+
+def normalize_team(name: str) -> str:
+    return TEAM_SUFFIX_PATTERN.sub("", name or "").strip().lower()
+
+def file_groups(data: dict) -> list:
+    """(team, fixture side, other team or None, MatchStats) of every group in a saved file.
+
+    The side is "home" or "away" for the teams of a fixture file and "recent" for a recent-matches file.
+    """
+    if "head_to_head" in data:
+        stats = MatchStats.from_dict(data["head_to_head"])
+        home, _, away = data["fixture"].partition(" vs ")
+        return [(home, "home", away, stats), (away, "away", home, stats)]
+    team = data["home_team"]
+    return [(team["name"], "recent", None, MatchStats.from_dict(team["recent_matches"]))]
+
+def team_sides(stats: MatchStats, team: str, other: str = None) -> np.ndarray:
+    """Side (0 home, 1 away) the team played in each match, or -1 if it cannot be told."""
+    names = [[normalize_team(name) if isinstance(name, str) else "" for name in pair] for pair in stats.teams[:len(stats)]]
+    names = np.array(names, dtype=str).reshape(len(stats), 2)
+    team, other = normalize_team(team), normalize_team(other)
+    sides = np.full(len(stats), -1, dtype=np.int8)
+    if other:
+        # H2H matches are always between the two fixture teams, so the opponent's side gives ours
+        sides[names[:, 1] == other] = 0
+        sides[names[:, 0] == other] = 1
+    sides[names[:, 1] == team] = 1
+    sides[names[:, 0] == team] = 0
+    sides[~stats.present["teams"][:len(stats)]] = -1
+    return sides
+
+def group_mean(groups: np.ndarray, values: np.ndarray, weights: np.ndarray, n_groups: int) -> np.ndarray:
+    """Weighted mean of values per group, ignoring NaN values; NaN for groups without any value."""
+    valid = ~np.isnan(values)
+    weights = np.where(valid, weights, 0.0)
+    totals = np.bincount(groups, weights=np.where(valid, values, 0.0) * weights, minlength=n_groups)
+    counts = np.bincount(groups, weights=weights, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+def compute_features(groups: list, decay: float = FORM_DECAY, lines=GOAL_LINES) -> list:
+    """Features of every (team, side, other, MatchStats) group, computed in one batched pass."""
+    group_ids, recency, sides = [], [], []
+    stat_columns = {stat: [] for stat in STAT_DTYPES}
+    for group_id, (team, _, other, stats) in enumerate(groups):
+        n = len(stats)
+        group_ids.append(np.full(n, group_id))
+        # match_one is the most recent match
+        recency.append(np.arange(n))
+        sides.append(team_sides(stats, team, other))
+        for stat in STAT_DTYPES:
+            column = stats.values[stat][:n].astype(np.float64)
+            column[~stats.present[stat][:n]] = np.nan
+            stat_columns[stat].append(column)
+
+    n_groups = len(groups)
+    if not n_groups:
+        return []
+    group_ids = np.concatenate(group_ids).astype(np.intp)
+    recency = np.concatenate(recency)
+    sides = np.concatenate(sides)
+    stat_columns = {stat: np.concatenate(columns).reshape(-1, 2) for stat, columns in stat_columns.items()}
+
+    # Matches the team cannot be placed in do not count
+    known = sides >= 0
+    group_ids, recency, sides = group_ids[known], recency[known], sides[known]
+    rows = np.arange(len(sides))
+    team_values = {stat: values[known][rows, sides] for stat, values in stat_columns.items()}
+    opponent_values = {stat: values[known][rows, 1 - sides] for stat, values in stat_columns.items()}
+
+    ones = np.ones(len(sides))
+    home, away = (sides == 0).astype(np.float64), (sides == 1).astype(np.float64)
+    goals_for, goals_against = team_values["goals"], opponent_values["goals"]
+    total_goals = goals_for + goals_against
+    goal_diff = goals_for - goals_against
+    points = np.where(np.isnan(goal_diff), np.nan, np.select([goal_diff > 0, goal_diff == 0], [3.0, 1.0], 0.0))
+    form_weights = decay ** recency
+
+    features = {
+        "matches": np.bincount(group_ids, minlength=n_groups),
+        "home_matches": np.bincount(group_ids, weights=home, minlength=n_groups).astype(int),
+        "away_matches": np.bincount(group_ids, weights=away, minlength=n_groups).astype(int),
+    }
+    for stat in STAT_DTYPES:
+        features[f"{stat}_for"] = group_mean(group_ids, team_values[stat], ones, n_groups)
+        features[f"{stat}_against"] = group_mean(group_ids, opponent_values[stat], ones, n_groups)
+    features["goals_for_home"] = group_mean(group_ids, goals_for, home, n_groups)
+    features["goals_for_away"] = group_mean(group_ids, goals_for, away, n_groups)
+    features["goals_against_home"] = group_mean(group_ids, goals_against, home, n_groups)
+    features["goals_against_away"] = group_mean(group_ids, goals_against, away, n_groups)
+    features["points"] = group_mean(group_ids, points, ones, n_groups)
+    features["points_home"] = group_mean(group_ids, points, home, n_groups)
+    features["points_away"] = group_mean(group_ids, points, away, n_groups)
+    features["form_points"] = group_mean(group_ids, points, form_weights, n_groups)
+    features["form_goal_diff"] = group_mean(group_ids, goal_diff, form_weights, n_groups)
+    features["x_goals_diff"] = group_mean(group_ids, team_values["x_goals"] - opponent_values["x_goals"], ones, n_groups)
+    for line in lines:
+        over = np.where(np.isnan(total_goals), np.nan, (total_goals > line).astype(np.float64))
+        features[f"over_{line}"] = group_mean(group_ids, over, ones, n_groups)
+
+    results = []
+    for group_id, (team, side, _, _) in enumerate(groups):
+        row = {"team": team, "side": side}
+        for name, values in features.items():
+            value = values[group_id].item()
+            row[name] = None if isinstance(value, float) and np.isnan(value) else value
+        results.append(row)
+    return results
+
+class FeatureCache:
+    """JSON file of computed features, keyed by input file hash and feature parameters."""
+
+    def __init__(self, path: str = FEATURE_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.entries = json.load(file)
+
+    def get(self, key: str):
+        return self.entries.get(key)
+
+    def put(self, key: str, rows: list):
+        self.entries[key] = rows
+
+    def save(self):
+        """Write the cache (to a temp file, then renamed)."""
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_json_atomic(self.path, self.entries, indent=None)
+
+def round_features(paths, decay: float = FORM_DECAY, lines=GOAL_LINES, cache: FeatureCache = None) -> list:
+    """Features of every team of every fixture file under paths.
+
+    Files whose content hash (with the same parameters) is in the cache are
+    not read again; all other files are computed together in one pass.
+    """
+    params = f"v{FEATURES_VERSION};decay={decay};lines={','.join(map(str, lines))}"
+    files = fixture_files(paths)
+    results, pending = {}, []
+    for path in files:
+        key = f"{file_hash(path)}:{params}"
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append((path, key))
+
+    groups, owners = [], []
+    for path, key in pending:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        for group in file_groups(data):
+            groups.append(group)
+            owners.append((path, key))
+    for (path, key), row in zip(owners, compute_features(groups, decay, lines)):
+        results.setdefault(path, []).append(row)
+    if cache:
+        for path, key in pending:
+            cache.put(key, results.get(path, []))
+        cache.save()
+    print(f"Features of {len(results)} files ({len(pending)} computed, {len(results) - len(pending)} cached)")
+
+    return [{"file": path, **row} for path in files for row in results.get(path, [])]
+
+def save_features(rows: list, path: str):
+    """Write feature rows as CSV (.csv) or JSON (anything else)."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else ["file"])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, file, indent=4, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute team form features from saved fixture files.")
+    parser.add_argument("paths", nargs="+", help="Output directories (or fixture files), e.g. Prem_8 bund_7")
+    parser.add_argument("-o", "--output", default="features.csv", help="Features file to write (.csv or .json)")
+    parser.add_argument("--decay", type=float, default=FORM_DECAY, help="Weight of each older match in the form features")
+    parser.add_argument("--lines", type=float, nargs="+", default=list(GOAL_LINES), help="Total goals lines of the over rates")
+    parser.add_argument("--cache", default=FEATURE_CACHE_PATH, help="Feature cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every file")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else FeatureCache(args.cache)
+    rows = round_features(args.paths, args.decay, args.lines, cache)
+    save_features(rows, args.output)
+    print(f"Saved {len(rows)} team feature rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+from collections import defaultdict
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright
+from checkpoint import Checkpoint
+from export import export_runs
+from instrumentation import add_metrics_arguments, finish_metrics, metrics_from_args
+from main import (MAX_CONCURRENT_DETAILS, MAX_CONCURRENT_FIXTURES, RECENT_DIR, WAIT_TIMEOUT_MS, add_policy_arguments,
+                  load_round_links, open_session, policy_from_args, print_run_summary, scrape_links)
+from match_cache import CACHE_PATH, MatchCache
+from output_writer import OutputWriter, league_from_url
+from scheduler import add_scheduler_arguments, scheduler_from_args
+
+def load_config(path: str) -> dict:
+    """Read a batch config file.
+
+    {
+        "fixtures_per_domain": {"www.soccer24.com": 6},   // optional, default MAX_CONCURRENT_FIXTURES
+        "details": 8,                                    // optional, reusable match-detail pages
+        "wait_timeout": 15000,                           // optional, ms
+        "recent_matches": 5,                             // optional, last matches scraped per team (default 0, none)
+        "recent_output": "output/recent",                // optional, directory of the per-team files
+        "jobs": [
+            {"url": "https://www.soccer24.com/england/premier-league/fixtures/", "round": "Round 8", "output": "output/prem_8"}
+        ]
+    }
+
+    "output" is optional, see job_output_dir. Every team's recent form is scraped
+    once, however many jobs it appears in.
+    """
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    for job in config.get("jobs", []):
+        if "url" not in job or "round" not in job:
+            raise ValueError(f"Every job needs a 'url' and a 'round': {job}")
+    return config
+
+def job_output_dir(job: dict) -> str:
+    """Output directory of a job: its "output" entry, or output/<league>_<round>, e.g. output/premier-league_round_8."""
+    if job.get("output"):
+        return job["output"]
+    league = league_from_url(job["url"])
+    round_slug = re.sub(r"\W+", "_", job["round"].strip().lower())
+    return os.path.join("output", f"{league}_{round_slug}")
+
+async def run_batch(config: dict, cache: MatchCache = None, policy=None, incremental: bool = False, scheduler=None,
+                    jsonl: bool = False, feeds: bool = True):
+    """Run every job of a config over one shared browser. Returns [(job, saved FixtureData list)]."""
+    jobs = config["jobs"]
+    fixtures_per_domain = config.get("fixtures_per_domain", {})
+
+    # One fixture semaphore per domain, shared by every job on that domain
+    domain_slots = {}
+
+    def slots_for(url: str) -> asyncio.Semaphore:
+        domain = urlsplit(url).hostname
+        if domain not in domain_slots:
+            domain_slots[domain] = asyncio.Semaphore(fixtures_per_domain.get(domain, MAX_CONCURRENT_FIXTURES))
+        return domain_slots[domain]
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            session = await open_session(browser, config.get("details", MAX_CONCURRENT_DETAILS), cache,
+                                         config.get("wait_timeout", WAIT_TIMEOUT_MS), policy,
+                                         recent_matches=config.get("recent_matches", 0),
+                                         recent_dir=config.get("recent_output", RECENT_DIR), scheduler=scheduler,
+                                         feeds=feeds)
+
+            # Each fixtures page is loaded once, however many rounds are taken from it
+            rounds_by_url = defaultdict(list)
+            for job in jobs:
+                rounds_by_url[job["url"]].append(job["round"])
+
+            async def load_links(url):
+                async with slots_for(url):
+                    try:
+                        return url, await load_round_links(session, url, rounds_by_url[url])
+                    except Exception as e:
+                        print(f"Could not load fixtures page {url}: {e}")
+                        return url, {}
+
+            links_by_url = dict(await asyncio.gather(*(load_links(url) for url in rounds_by_url)))
+
+            async def run_job(job):
+                links = links_by_url[job["url"]].get(job["round"])
+                if links is None:
+                    print(f"{job['round']} not found on {job['url']}.")
+                    return job, []
+                output_dir = job_output_dir(job)
+                checkpoint = Checkpoint(output_dir)
+                writer = OutputWriter(output_dir, jsonl, league_from_url(job["url"]), job["round"])
+                try:
+                    results = await scrape_links(session, links, slots_for(job["url"]), checkpoint, incremental,
+                                                 output_dir, writer)
+                finally:
+                    writer.close()
+                print(f"Finished {job['round']} of {job['url']}: {len(results)} fixtures saved to {output_dir} {checkpoint.counts()}")
+                return job, results
+
+            return await asyncio.gather(*(run_job(job) for job in jobs))
+        finally:
+            await browser.close()
+            print_run_summary(policy)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape several Soccer24 leagues and rounds in one process.")
+    parser.add_argument("config", help="Batch config file (JSON) listing the (league url, round) jobs")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Match-detail cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Scrape every H2H match even if it is cached")
+    parser.add_argument("--incremental", action="store_true", help="Skip fixtures already saved completely; retry failed or partial ones")
+    parser.add_argument("--jsonl", action="store_true", help="Also append every fixture to one JSON Lines file per job")
+    parser.add_argument("--dom-only", action="store_true", help="Read statistics from the rendered page instead of the site's feeds")
+    parser.add_argument("--export", help="Also export every job to one columnar dataset (.parquet or .npz)")
+    add_policy_arguments(parser)
+    add_scheduler_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    sinks = metrics_from_args(args)
+    cache = None if args.no_cache else MatchCache(args.cache)
+    try:
+        asyncio.run(run_batch(config, cache, policy_from_args(args), args.incremental, scheduler_from_args(args),
+                              args.jsonl, not args.dom_only))
+        if args.export:
+            export_runs(sorted({job_output_dir(job) for job in config["jobs"]}), args.export)
+    finally:
+        if cache:
+            cache.close()
+        finish_metrics(args, sinks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from instrumentation import METRICS, PHASE, ROUND_TRIP
+from main import (MAX_CONCURRENT_DETAILS, MAX_CONCURRENT_FIXTURES, WAIT_TIMEOUT_MS, add_policy_arguments,
+                  policy_from_args, run)
+from replay import Recording, Replayer
+from scheduler import add_scheduler_arguments, scheduler_from_args
+
+def compare_outputs(expected_dir: str, output_dir: str) -> list:
+    """Names of fixture files that are missing from output_dir or differ from expected_dir."""
+    mismatches = []
+    for name in sorted(os.listdir(expected_dir)):
+        if not name.endswith(".json") or name.startswith("."):
+            continue
+        output_path = os.path.join(output_dir, name)
+        if not os.path.exists(output_path):
+            mismatches.append(name)
+            continue
+        with open(os.path.join(expected_dir, name), encoding="utf-8") as expected, \
+                open(output_path, encoding="utf-8") as output:
+            if json.load(expected) != json.load(output):
+                mismatches.append(name)
+    return mismatches
+
+async def benchmark_run(recording: Recording, max_fixtures: int, max_details: int,
+                        wait_timeout: float, policy=None, scheduler=None, feeds: bool = True) -> dict:
+    """Replay a recorded round once, with no network and no cache, and return its report."""
+    METRICS.reset()
+    replayer = Replayer(recording)
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        results = await run(recording.meta["fixtures_url"], recording.meta["round"], max_fixtures, max_details,
+                            cache=None, wait_timeout=wait_timeout, policy=policy, output_dir=output_dir,
+                            recording=replayer, scheduler=scheduler, feeds=feeds)
+        wall_time = time.perf_counter() - start
+        mismatches = compare_outputs(recording.expected_dir, output_dir)
+
+    return {
+        "wall_time_s": round(wall_time, 3),
+        "fixtures": len(results),
+        "pages_opened": METRICS.counters["pages opened"],
+        "ipc_calls": METRICS.round_trips(),
+        "timeouts": METRICS.counters["timeouts"],
+        "retries": METRICS.counters["retries"],
+        "stats_from_feed": METRICS.counters["stats from feed"],
+        "responses_served": replayer.served,
+        "responses_missed": replayer.missed,
+        "mismatched_files": mismatches,
+        "phases_s": {name: round(seconds, 3) for name, seconds in METRICS.totals(PHASE).items()},
+        "round_trips_s": {name: round(seconds, 3) for name, seconds in METRICS.totals(ROUND_TRIP).items()},
+    }
+
+def print_report(reports: list):
+    """Print one line per run and the per-phase time of the fastest run."""
+    for number, report in enumerate(reports, start=1):
+        print(f"run {number}: wall={report['wall_time_s']:.2f} s  fixtures={report['fixtures']}  "
+              f"pages={report['pages_opened']}  ipc={report['ipc_calls']}  timeouts={report['timeouts']}  retries={report['retries']}  "
+              f"served={report['responses_served']}  missed={report['responses_missed']}  "
+              f"mismatches={len(report['mismatched_files'])}")
+    best = min(reports, key=lambda report: report["wall_time_s"])
+    print("Time per phase and round-trip (fastest run, summed over concurrent work):")
+    for kind in ("phases_s", "round_trips_s"):
+        for name, seconds in sorted(best[kind].items(), key=lambda item: -item[1]):
+            print(f"  {name:<24} {seconds:8.2f} s")
+    for name in best["mismatched_files"]:
+        print(f"  differs from recording: {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a recorded round (see replay.py), offline.")
+    parser.add_argument("path", help="Recording directory made by replay.py")
+    parser.add_argument("--runs", type=int, default=3, help="Number of replayed runs")
+    parser.add_argument("--fixtures", type=int, default=MAX_CONCURRENT_FIXTURES, help="Fixtures scraped at the same time")
+    parser.add_argument("--details", type=int, default=MAX_CONCURRENT_DETAILS, help="Reusable match-detail pages")
+    parser.add_argument("--wait-timeout", type=int, default=WAIT_TIMEOUT_MS, help="Upper bound (ms) for each page readiness wait")
+    parser.add_argument("--report", help="Also write the reports to this JSON file")
+    parser.add_argument("--dom-only", action="store_true", help="Read statistics from the rendered page instead of the recorded feeds")
+    add_policy_arguments(parser)
+    add_scheduler_arguments(parser)
+    args = parser.parse_args()
+
+    recording = Recording(args.path)
+    if not recording.responses:
+        parser.error(f"No recording found in {args.path}")
+
+    reports = []
+    for _ in range(args.runs):
+        reports.append(asyncio.run(benchmark_run(recording, args.fixtures, args.details, args.wait_timeout,
+                                                 policy_from_args(args), scheduler_from_args(args),
+                                                 not args.dom_only)))
+    print_report(reports)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(reports, file, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from output_writer import write_json_atomic
+
+# Manifest file kept next to the fixture files (hidden, so *.json globs skip it)
+MANIFEST_NAME = ".manifest.json"
+
+# Fixture statuses recorded in the manifest
+COMPLETE = "complete"  # every H2H match scraped without a timeout or error
+PARTIAL = "partial"    # saved, but at least one match is missing data (e.g. 1st Half stats timed out)
+FAILED = "failed"      # nothing saved
+
+def file_hash(path: str):
+    """SHA-256 of a file's content, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+class Checkpoint:
+    """Manifest of the fixture links of a round: status, saved file, content hash and timestamp per link.
+
+    Every change is written straight away (to a temp file, then renamed), so a
+    crashed run leaves an accurate manifest for the next one to resume from.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                self.entries = json.load(file)
+
+    def is_done(self, link: str) -> bool:
+        """True if link was scraped completely and its file is still there, unchanged."""
+        entry = self.entries.get(link)
+        if not entry or entry["status"] != COMPLETE:
+            return False
+        return file_hash(entry["file"]) == entry["hash"]
+
+    def record(self, link: str, status: str, fixture: str = None, path: str = None):
+        """Store the outcome of a fixture link and write the manifest."""
+        self.entries[link] = {
+            "status": status,
+            "fixture": fixture,
+            "file": path,
+            "hash": file_hash(path) if path else None,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_json_atomic(self.path, self.entries)
+
+    def counts(self) -> dict:
+        """Number of links per status."""
+        counts = {}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
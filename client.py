@@ -0,0 +1,72 @@
+import argparse
+import json
+import socket
+import sys
+
+# Address the daemon listens on (local connections only); kept here so the client starts without Playwright
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+
+def submit(request: dict, host: str = DAEMON_HOST, port: int = DAEMON_PORT) -> dict:
+    """Send one request to a running daemon.py and return its answer."""
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        answer = b""
+        while not answer.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            answer += chunk
+    if not answer.strip():
+        raise ConnectionError(f"Daemon on {host}:{port} closed the connection without answering")
+    return json.loads(answer)
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit a job to a running scraper daemon (daemon.py).")
+    parser.add_argument("--host", default=DAEMON_HOST, help="Daemon address")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="Daemon port")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    round_parser = commands.add_parser("round", help="Scrape one round of a league")
+    round_parser.add_argument("--url", required=True, help="League fixtures page")
+    round_parser.add_argument("--round", required=True, help='Round title as shown on the page, e.g. "Round 8"')
+    round_parser.add_argument("--output", help="Output directory (default output/<league>_<round>)")
+    round_parser.add_argument("--incremental", action="store_true", help="Skip fixtures already saved completely")
+    round_parser.add_argument("--jsonl", action="store_true", help="Also append every fixture to one JSON Lines file of the job")
+
+    matches_parser = commands.add_parser("matches", help="Scrape the details of some matches")
+    matches_parser.add_argument("match_ids", nargs="+", help="Soccer24 match ids")
+    matches_parser.add_argument("-o", "--output", help="Write the details to this JSON file instead of printing them")
+
+    commands.add_parser("status", help="Print the daemon's metrics")
+    commands.add_parser("shutdown", help="Stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "round":
+        request = {"type": "round", "url": args.url, "round": args.round, "output": args.output,
+                   "incremental": args.incremental, "jsonl": args.jsonl}
+    elif args.command == "matches":
+        request = {"type": "matches", "match_ids": args.match_ids}
+    else:
+        request = {"type": args.command}
+
+    try:
+        answer = submit(request, args.host, args.port)
+    except ConnectionRefusedError:
+        sys.exit(f"No daemon listening on {args.host}:{args.port}; start one with: python daemon.py")
+    except (ConnectionError, json.JSONDecodeError) as e:
+        sys.exit(f"No valid answer from the daemon: {e}")
+
+    if not answer["ok"]:
+        sys.exit(f"Job failed after {answer['seconds']} s: {answer['error']}")
+    if args.command == "status":
+        print(answer["metrics"])
+    elif args.command == "matches" and args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(answer["details"], file, indent=4, ensure_ascii=False)
+        print(f"Saved {len(answer['details'])} match details to {args.output} in {answer['seconds']} s")
+    else:
+        print(json.dumps(answer, indent=4, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
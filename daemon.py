@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright
+from batch import job_output_dir
+from checkpoint import Checkpoint
+from client import DAEMON_HOST, DAEMON_PORT
+from instrumentation import METRICS, add_metrics_arguments, finish_metrics, metrics_from_args
+from main import (MAX_CONCURRENT_DETAILS, MAX_CONCURRENT_FIXTURES, RECENT_DIR, SITE_URL, WAIT_TIMEOUT_MS,
+                  add_policy_arguments, load_round_links, open_session, policy_from_args, scrape_links)
+from match_cache import CACHE_PATH, MatchCache
+from output_writer import OutputWriter, league_from_url
+from scheduler import add_scheduler_arguments, scheduler_from_args
+
+# Seconds a loaded fixtures page's round links are reused by later jobs
+FIXTURES_TTL = 600
+# Sites the browser may be sent to by a job (the host or any subdomain of it)
+ALLOWED_SITES = ("soccer24.com",)
+
+def checked_url(url: str) -> str:
+    """url if it is an http(s) page of one of ALLOWED_SITES, else ValueError."""
+    parts = urlsplit(url or "")
+    host = parts.hostname or ""
+    if parts.scheme not in ("http", "https") or not any(host == site or host.endswith("." + site) for site in ALLOWED_SITES):
+        raise ValueError(f"Refusing to navigate to {url!r}: not a page of {', '.join(ALLOWED_SITES)}")
+    return url
+
+def checked_output_dir(path: str, root: str) -> str:
+    """path joined onto root (absolute paths are kept), if that resolves to root or a directory below it, else ValueError."""
+    path = os.path.normpath(os.path.join(root, path))
+    real_root = os.path.realpath(root)
+    if os.path.commonpath([os.path.realpath(path), real_root]) != real_root:
+        raise ValueError(f"Refusing to write to {path!r}: outside {real_root}")
+    return path
+
+class ScraperDaemon:
+    """Keeps a browser, a warm match-detail page pool and the match cache open, and runs submitted jobs.
+
+    The protocol is one JSON request line per connection, answered by one JSON line:
+        {"type": "round", "url": ..., "round": ..., "output": ..., "incremental": false, "jsonl": false}
+        {"type": "matches", "match_ids": [...], "site": ...}
+        {"type": "status"}
+        {"type": "shutdown"}
+    Every answer has "ok" and "seconds", plus the job's result or an "error".
+    Job URLs must be pages of ALLOWED_SITES and output directories must be
+    inside output_root, so a client cannot send the browser or files anywhere.
+    """
+
+    def __init__(self, max_fixtures: int = MAX_CONCURRENT_FIXTURES, max_details: int = MAX_CONCURRENT_DETAILS,
+                 cache: MatchCache = None, wait_timeout: float = WAIT_TIMEOUT_MS, policy=None, scheduler=None,
+                 recent_matches: int = 0, recent_dir: str = RECENT_DIR, feeds: bool = True, output_root: str = "."):
+        self.output_root = output_root
+        self.options = dict(max_details=max_details, cache=cache, wait_timeout=wait_timeout, policy=policy,
+                            recent_matches=recent_matches, recent_dir=recent_dir, scheduler=scheduler, feeds=feeds)
+        self.fixture_slots = asyncio.Semaphore(max_fixtures)
+        self.session = None
+        # {fixtures url: (loaded at, {round name: links})}
+        self.round_links = {}
+        self.active_jobs = 0
+        self.stopped = asyncio.Event()
+
+    async def start(self, browser):
+        """Open the session and every page of its match-detail pool."""
+        self.session = await open_session(browser, **self.options)
+        await self.session.pool.warm()
+
+    async def links(self, url: str, round_name: str):
+        """Links of a round, reusing a fixtures page loaded less than FIXTURES_TTL seconds ago."""
+        loaded_at, rounds = self.round_links.get(url, (0, {}))
+        if round_name not in rounds or time.monotonic() - loaded_at > FIXTURES_TTL:
+            rounds = await load_round_links(self.session, url, [round_name])
+            self.round_links[url] = (time.monotonic(), rounds)
+        return rounds[round_name]
+
+    async def run_round(self, request: dict) -> dict:
+        output_dir = checked_output_dir(job_output_dir(request), self.output_root)
+        links = await self.links(checked_url(request["url"]), request["round"])
+        if links is None:
+            raise ValueError(f"{request['round']} not found on {request['url']}")
+        checkpoint = Checkpoint(output_dir)
+        writer = OutputWriter(output_dir, request.get("jsonl", False), league_from_url(request["url"]), request["round"])
+        try:
+            results = await scrape_links(self.session, links, self.fixture_slots, checkpoint,
+                                         request.get("incremental", False), output_dir, writer)
+        finally:
+            writer.close()
+        return {"fixtures": len(results), "output": output_dir, "checkpoint": checkpoint.counts()}
+
+    async def run_matches(self, request: dict) -> dict:
+        site_url = checked_url(request.get("site", SITE_URL))
+        match_ids = request["match_ids"]
+        details = await asyncio.gather(*(self.session.match_detail(match_id, match_id, site_url) for match_id in match_ids))
+        return {"details": {match_id: {**detail.to_cache(), "complete": detail.complete}
+                            for match_id, detail in zip(match_ids, details)}}
+
+    async def handle(self, request: dict) -> dict:
+        """Run one request and return its answer."""
+        kind = request.get("type")
+        if kind == "status":
+            return {"active_jobs": self.active_jobs, "metrics": METRICS.summary_table()}
+        if kind == "shutdown":
+            self.stopped.set()
+            return {}
+        jobs = {"round": self.run_round, "matches": self.run_matches}
+        if kind not in jobs:
+            raise ValueError(f"Unknown request type: {kind}")
+        self.active_jobs += 1
+        try:
+            return await jobs[kind](request)
+        finally:
+            self.active_jobs -= 1
+            if not self.active_jobs:
+                self.session.end_job()
+
+    async def serve_client(self, reader, writer):
+        start = time.perf_counter()
+        try:
+            request = json.loads(await reader.readline())
+            print(f"[daemon] {request.get('type')} job: {request}")
+            answer = {"ok": True, **await self.handle(request)}
+        except Exception as e:
+            print(f"[daemon] Job failed: {e}")
+            answer = {"ok": False, "error": str(e)}
+        answer["seconds"] = round(time.perf_counter() - start, 3)
+        writer.write((json.dumps(answer, ensure_ascii=False) + "\n").encode("utf-8"))
+        await writer.drain()
+        writer.close()
+
+async def serve(daemon: ScraperDaemon, host: str = DAEMON_HOST, port: int = DAEMON_PORT):
+    """Launch the browser, warm the daemon up and answer jobs until a shutdown request."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            await daemon.start(browser)
+            server = await asyncio.start_server(daemon.serve_client, host, port)
+            print(f"[daemon] Ready on {host}:{port}")
+            async with server:
+                await daemon.stopped.wait()
+        finally:
+            await browser.close()
+            print(METRICS.summary_table())
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep a warm browser open and run scrape jobs submitted with client.py.")
+    parser.add_argument("--host", default=DAEMON_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="Port to listen on")
+    parser.add_argument("--output-root", default=".", help="Directory relative output directories are resolved against and every job's output must be inside")
+    parser.add_argument("--fixtures", type=int, default=MAX_CONCURRENT_FIXTURES, help="Fixtures scraped at the same time, over all jobs")
+    parser.add_argument("--details", type=int, default=MAX_CONCURRENT_DETAILS, help="Reusable match-detail pages, opened at startup")
+    parser.add_argument("--wait-timeout", type=int, default=WAIT_TIMEOUT_MS, help="Upper bound (ms) for each page readiness wait")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Match-detail cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Scrape every H2H match even if it is cached")
+    parser.add_argument("--recent", type=int, default=0, help="Also scrape the last N matches of every team of a round")
+    parser.add_argument("--recent-dir", default=RECENT_DIR, help="Directory of the per-team recent-matches files")
+    parser.add_argument("--dom-only", action="store_true", help="Read statistics from the rendered page instead of the site's feeds")
+    add_policy_arguments(parser)
+    add_scheduler_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    sinks = metrics_from_args(args)
+    cache = None if args.no_cache else MatchCache(args.cache)
+    try:
+        daemon = ScraperDaemon(args.fixtures, args.details, cache, args.wait_timeout, policy_from_args(args),
+                               scheduler_from_args(args), args.recent, args.recent_dir, not args.dom_only,
+                               args.output_root)
+        asyncio.run(serve(daemon, args.host, args.port))
+    finally:
+        if cache:
+            cache.close()
+        finish_metrics(args, sinks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import numpy as np
+from match_stats import STAT_DTYPES
+
+# Parquet output is optional; without pyarrow runs are exported to .npz
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Value of a missing integer statistic in .npz files (missing x_goals are NaN); Parquet uses nulls
+MISSING = -1
+# Sides of an H2H match: index 0 of every two-element list is the home team, 1 the away team
+HOME, AWAY = 0, 1
+
+def fixture_files(paths) -> list:
+    """Fixture JSON files of the given output directories and/or files, each listed once."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.endswith(".json") and not name.startswith("."))
+            files.extend(os.path.join(path, name) for name in names)
+        else:
+            files.append(path)
+    unique = {}
+    for file in files:
+        unique.setdefault(os.path.realpath(file), file)
+    return list(unique.values())
+
+def fixture_rows(data: dict, run: str) -> list:
+    """One row per (H2H match, side) of a saved FixtureData dict."""
+    head_to_head = data["head_to_head"]
+    rows = []
+    for match, (match_key, teams) in enumerate(head_to_head["teams"].items(), start=1):
+        for side in (HOME, AWAY):
+            row = {
+                "run": run,
+                "fixture": data["fixture"],
+                "match": match,
+                "match_key": match_key,
+                "side": side,
+                "team": teams[side] if len(teams) == 2 else "",
+                "opponent": teams[1 - side] if len(teams) == 2 else "",
+            }
+            for stat in STAT_DTYPES:
+                values = head_to_head.get(stat, {}).get(match_key) or []
+                row[stat] = values[side] if len(values) == 2 else None
+            rows.append(row)
+    return rows
+
+def collect_rows(paths) -> list:
+    """Rows of every fixture file under paths; the run column is the name of the file's directory.
+
+    Recent-form files (the save_to_json.py layout) have no head_to_head section and are skipped.
+    """
+    rows = []
+    for path in fixture_files(paths):
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if "head_to_head" not in data:
+            print(f"Skipping {path}: not a fixture file")
+            continue
+        run = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        rows.extend(fixture_rows(data, run))
+    return rows
+
+def write_npz(rows: list, path: str):
+    """Write rows as one compressed NumPy array per column."""
+    columns = {
+        "run": np.array([row["run"] for row in rows], dtype=str),
+        "fixture": np.array([row["fixture"] for row in rows], dtype=str),
+        "match": np.array([row["match"] for row in rows], dtype=np.int16),
+        "match_key": np.array([row["match_key"] for row in rows], dtype=str),
+        "side": np.array([row["side"] for row in rows], dtype=np.int8),
+        "team": np.array([row["team"] for row in rows], dtype=str),
+        "opponent": np.array([row["opponent"] for row in rows], dtype=str),
+    }
+    for stat, dtype in STAT_DTYPES.items():
+        missing = np.nan if np.issubdtype(dtype, np.floating) else MISSING
+        columns[stat] = np.array([missing if row[stat] is None else row[stat] for row in rows], dtype=dtype)
+    np.savez_compressed(path, **columns)
+
+def write_parquet(rows: list, path: str):
+    """Write rows as a Parquet table (missing statistics are nulls)."""
+    schema = pa.schema(
+        [("run", pa.string()), ("fixture", pa.string()), ("match", pa.int16()), ("match_key", pa.string()),
+         ("side", pa.int8()), ("team", pa.string()), ("opponent", pa.string())]
+        + [(stat, pa.from_numpy_dtype(dtype)) for stat, dtype in STAT_DTYPES.items()]
+    )
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path)
+
+def export_runs(paths, output_path: str) -> int:
+    """Export the fixture files of one or more runs to a single .parquet or .npz dataset. Returns the number of rows."""
+    rows = collect_rows(paths)
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Written next to the target and renamed, so readers never see half a dataset
+    temp_path = output_path + ".tmp"
+    if output_path.endswith(".parquet"):
+        if pa is None:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow); use a .npz output instead.")
+        write_parquet(rows, temp_path)
+    elif output_path.endswith(".npz"):
+        # np.savez adds .npz to names that do not end with it
+        temp_path = output_path[:-len(".npz")] + ".tmp.npz"
+        write_npz(rows, temp_path)
+    else:
+        raise ValueError(f"Unknown export format (use .parquet or .npz): {output_path}")
+    os.replace(temp_path, output_path)
+    print(f"Exported {len(rows)} rows to {output_path}")
+    return len(rows)
+
+def load_dataset(path: str) -> dict:
+    """Read an exported dataset back as {column: NumPy array}, with missing values as in the .npz format."""
+    if path.endswith(".parquet"):
+        if pa is None:
+            raise ValueError("Reading Parquet needs pyarrow (pip install pyarrow).")
+        table = pq.read_table(path)
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if name in STAT_DTYPES and not pa.types.is_floating(column.type):
+                column = pc.fill_null(column, MISSING)
+            columns[name] = column.to_numpy()
+        return columns
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the fixture JSON files of one or more runs to one columnar dataset.")
+    parser.add_argument("paths", nargs="+", help="Output directories (or fixture files) to export, e.g. Prem_8 bund_7")
+    parser.add_argument("-o", "--output", required=True, help="Dataset file to write: .parquet (needs pyarrow) or .npz")
+    args = parser.parse_args()
+
+    try:
+        export_runs(args.paths, args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Batched in-page extractors.
+
+Each extractor runs a single page.evaluate and returns plain Python data, so
+reading a whole tab costs one Playwright round-trip however many rows it has.
+"""
+
+# Selector of a statistics row in the Stats tab
+STATS_ROW_SELECTOR = 'div._row_18zuy_8[data-testid="wcl-statistics"]'
+
+# Statistic categories copied into MatchDetail: category -> (attribute, converter).
+# Every category is extracted anyway, so adding a metric is one line here and no extra latency.
+FULL_TIME_FIELDS = {
+    "Expected Goals (xG)": ("x_goals", float),
+    "Corner Kicks": ("corners", int),
+    "Fouls": ("fouls", int),
+    "Yellow Cards": ("FT_cards", int),
+}
+FIRST_HALF_FIELDS = {
+    "Yellow Cards": ("HT_cards", int),
+}
+
+# Every statistics row as {category: [home text, away text]}
+STATS_JS = """
+    (selector) => {
+        const stats = {};
+        for (const row of document.querySelectorAll(selector)) {
+            const category = row.querySelector('div._category_1haer_4 strong');
+            const home = row.querySelector('div._value_7ptpb_4._homeValue_7ptpb_9[data-testid="wcl-statistics-value"] strong');
+            const away = row.querySelector('div._value_7ptpb_4._awayValue_7ptpb_13[data-testid="wcl-statistics-value"] strong');
+            if (category && home && away) {
+                stats[category.innerText.trim()] = [home.innerText.trim(), away.innerText.trim()];
+            }
+        }
+        return stats;
+    }
+"""
+
+# Team names, score and start time of a match page; missing parts are null
+HEADER_JS = """
+    () => {
+        const text = (element) => element ? element.innerText.trim() : null;
+        const home = document.querySelector('div.duelParticipant__home a.participant__participantName.participant__overflow')
+            || document.querySelector('a.participant__participantName.participant__overflow');
+        const away = document.querySelector('div.duelParticipant__away a.participant__participantName.participant__overflow');
+        const spans = document.querySelectorAll('div.detailScore__wrapper span');
+        return {
+            home: text(home),
+            away: text(away),
+            divider: text(document.querySelector('span.detailScore__divider')),
+            date: text(document.querySelector('div.duelParticipant__startTime')),
+            score: spans.length >= 3 ? [text(spans[0]), text(spans[2])] : null,
+        };
+    }
+"""
+
+# Rows of the H2H section with the given title as {index, date, title, link}, or null without that section
+H2H_ROWS_JS = """
+    (sectionTitle) => {
+        const section = Array.from(document.querySelectorAll('div.h2h__section')).find((candidate) => {
+            const title = candidate.querySelector('div.section__title');
+            return title && title.textContent.trim() === sectionTitle;
+        });
+        if (!section) {
+            return null;
+        }
+        return Array.from(section.querySelectorAll('div.h2h__row'), (row, index) => {
+            const date = row.querySelector('span.h2h__date');
+            const link = row.href || (row.querySelector('a[href]') || {}).href || row.getAttribute('onclick') || '';
+            return {index, date: date ? date.innerText.trim() : null, title: row.getAttribute('title'), link};
+        });
+    }
+"""
+
+async def extract_stats(page, selector: str = STATS_ROW_SELECTOR) -> dict:
+    """Return every statistic of the current tab as {category: [home text, away text]}."""
+    return await page.evaluate(STATS_JS, selector)
+
+async def extract_header(page) -> dict:
+    """Return the team names, divider, score and start time texts of a match page."""
+    return await page.evaluate(HEADER_JS)
+
+async def extract_h2h_rows(page, section_title: str = "Head-to-head matches"):
+    """Return the rows of an H2H section as dicts with index, date, title and link, or None without the section."""
+    return await page.evaluate(H2H_ROWS_JS, section_title)
+
+def h2h_section_locator(page, section_title: str = "Head-to-head matches"):
+    """Locator for the H2H section with the given title, e.g. "Last matches: Arsenal"."""
+    return page.locator(
+        f'//div[contains(@class, "h2h__section") and .//div[contains(@class, "section__title") and normalize-space(text())="{section_title}"]]'
+    )
+
+def h2h_row_locator(page, index: int, section_title: str = "Head-to-head matches"):
+    """Locator for the index-th row of an H2H section, for clicking a row returned by extract_h2h_rows."""
+    return h2h_section_locator(page, section_title).locator('div.h2h__row').nth(index)
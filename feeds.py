@@ -0,0 +1,121 @@
+"""Parsers for the data feeds the Soccer24 pages fetch.
+
+The match page loads its data as text feeds from the site's feed host, e.g.
+.../feed/df_st_1_<match id> for the statistics. A feed is a list of records
+separated by "~"; each record is a list of "¬"-separated fields written as
+KEY÷value. In the statistics feed, SE starts a period ("Match", "1st Half",
+"2nd Half"), SF a section, and every SG (category) record carries the home
+(SH) and away (SI) values. Parsing these avoids the hashed class names of the
+rendered statistics rows, and one feed holds every period at once.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from extractors import FIRST_HALF_FIELDS, FULL_TIME_FIELDS
+from match_stats import match_key
+from output_writer import read_index
+
+RECORD_SEPARATOR = "~"
+FIELD_SEPARATOR = "¬"
+VALUE_SEPARATOR = "÷"
+
+# URL of the statistics feed of a match
+STATS_FEED_PATTERN = re.compile(r"/feed/df_st_\d+_([A-Za-z0-9]{8})\b")
+
+# Periods of the statistics feed
+FULL_TIME_PERIOD = "Match"
+FIRST_HALF_PERIOD = "1st Half"
+
+def parse_feed(text: str) -> list:
+    """Records of a feed as dicts of KEY: value."""
+    records = []
+    for record in text.split(RECORD_SEPARATOR):
+        fields = dict(field.split(VALUE_SEPARATOR, 1) for field in record.split(FIELD_SEPARATOR) if VALUE_SEPARATOR in field)
+        if fields:
+            records.append(fields)
+    return records
+
+def parse_statistics_feed(text: str) -> dict:
+    """Statistics of a df_st feed as {period: {category: [home text, away text]}}, like extract_stats per tab."""
+    periods = {}
+    period = FULL_TIME_PERIOD
+    for record in parse_feed(text):
+        if "SE" in record:
+            period = record["SE"]
+        if "SG" in record and "SH" in record and "SI" in record:
+            # The first value wins when a category is repeated in several sections
+            periods.setdefault(period, {}).setdefault(record["SG"], [record["SH"], record["SI"]])
+    return periods
+
+def stats_feed_match_id(url: str):
+    """Match id of a statistics feed URL, or None for any other URL."""
+    match = STATS_FEED_PATTERN.search(url)
+    return match.group(1) if match else None
+
+def recorded_statistics(path: str) -> dict:
+    """{match id: parsed statistics} of every statistics feed in a recording made by replay.py."""
+    with open(os.path.join(path, "index.json"), encoding="utf-8") as file:
+        responses = json.load(file)["responses"]
+    statistics = {}
+    for key, entry in responses.items():
+        match_id = stats_feed_match_id(key.split(" ", 2)[1])
+        if match_id:
+            with open(os.path.join(path, "bodies", entry["body"]), encoding="utf-8") as body:
+                statistics[match_id] = parse_statistics_feed(body.read())
+    return statistics
+
+def check_recording(path: str):
+    """Compare the parsed statistics feeds of a recording with the fixture files it saved.
+
+    Returns (number of values compared, list of mismatches). The recording should be made with
+    `replay.py --dom-only`, so the saved values come from the rendered pages and not the feeds.
+    """
+    statistics = recorded_statistics(path)
+    expected_dir = os.path.join(path, "expected")
+    compared, mismatches = 0, []
+    for entry in read_index(expected_dir):
+        with open(os.path.join(expected_dir, entry["file"]), encoding="utf-8") as file:
+            head_to_head = json.load(file).get("head_to_head", {})
+        # match_ids are in the order of match_one, match_two, ...
+        for index, match_id in enumerate(entry.get("match_ids") or [], start=1):
+            periods = statistics.get(match_id)
+            if not periods:
+                continue
+            key = match_key(index)
+            for period, fields in ((FULL_TIME_PERIOD, FULL_TIME_FIELDS), (FIRST_HALF_PERIOD, FIRST_HALF_FIELDS)):
+                stats = periods.get(period, {})
+                for category, (attribute, convert) in fields.items():
+                    if category not in stats:
+                        continue
+                    compared += 1
+                    try:
+                        parsed = [convert(value) for value in stats[category]]
+                    except ValueError:
+                        parsed = stats[category]
+                    saved = head_to_head.get(attribute, {}).get(key)
+                    if parsed != saved:
+                        mismatches.append(f"{entry['file']} {key} ({match_id}) {attribute}: feed {parsed}, page {saved}")
+    return compared, mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse the statistics feeds stored in a recording (see replay.py).")
+    parser.add_argument("path", help="Recording directory, e.g. recordings/prem_8")
+    parser.add_argument("--check", action="store_true", help="Compare the parsed feeds with the recording's saved fixture files")
+    args = parser.parse_args()
+
+    if args.check:
+        compared, mismatches = check_recording(args.path)
+        for mismatch in mismatches:
+            print(mismatch)
+        print(f"{compared - len(mismatches)}/{compared} feed values match the saved fixture files")
+        sys.exit(1 if mismatches or not compared else 0)
+
+    statistics = recorded_statistics(args.path)
+    for match_id, periods in sorted(statistics.items()):
+        print(f"{match_id}: " + ", ".join(f"{period} ({len(stats)} categories)" for period, stats in periods.items()))
+    print(f"{len(statistics)} statistics feeds in {args.path}")
+
+if __name__ == "__main__":
+    main()
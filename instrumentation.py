@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from output_writer import write_text_atomic
+
+# Kinds of timed work: a phase is a step of the scrape (fixture load, match detail, save, ...),
+# a round-trip is a single Playwright call (navigation, wait, extraction)
+PHASE = "phase"
+ROUND_TRIP = "round_trip"
+
+class Metrics:
+    """Timers and counters for a run.
+
+    Every timed block is recorded under (kind, name) with its duration and
+    outcome ("ok", "timeout" or "error"), counted, and sent as an event to the
+    attached sinks (e.g. a JSON-lines file).
+    """
+
+    def __init__(self, log_round_trips: bool = True):
+        # Print a "[time] <name>: <ms>" line for every round-trip as it finishes
+        self.log_round_trips = log_round_trips
+        self.timings = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.counters = Counter()
+        self.sinks = []
+
+    def reset(self):
+        """Forget everything recorded so far (sinks stay attached)."""
+        self.timings.clear()
+        self.outcomes.clear()
+        self.counters.clear()
+
+    def emit(self, event: dict):
+        event["ts"] = round(time.time(), 3)
+        for sink in self.sinks:
+            sink.write(event)
+
+    def record(self, kind: str, name: str, elapsed_ms: float, outcome: str = "ok", **labels):
+        """Record one timed block."""
+        self.timings[kind, name].append(elapsed_ms)
+        self.outcomes[kind, name][outcome] += 1
+        if outcome == "timeout":
+            self.counters["timeouts"] += 1
+        elif outcome == "error":
+            self.counters["errors"] += 1
+        if kind == ROUND_TRIP and self.log_round_trips:
+            print(f"[time] {name}: {elapsed_ms:.0f} ms ({outcome})")
+        self.emit({"type": kind, "name": name, "ms": round(elapsed_ms, 1), "outcome": outcome, **labels})
+
+    @contextmanager
+    def timer(self, kind: str, name: str, **labels):
+        """Time the enclosed block; exceptions are recorded as its outcome and re-raised."""
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except PlaywrightTimeoutError:
+            outcome = "timeout"
+            raise
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.record(kind, name, (time.perf_counter() - start) * 1000, outcome, **labels)
+
+    def phase(self, name: str, **labels):
+        """Time one phase of the scrape, e.g. `with METRICS.phase("save", fixture=fixture):`."""
+        return self.timer(PHASE, name, **labels)
+
+    async def timed(self, name: str, awaitable, **labels):
+        """Await one browser round-trip and record how long it took."""
+        with self.timer(ROUND_TRIP, name, **labels):
+            return await awaitable
+
+    def count(self, name: str, amount: int = 1, **labels):
+        """Increase a counter, e.g. pages opened or retries."""
+        self.counters[name] += amount
+        self.emit({"type": "count", "name": name, "amount": amount, **labels})
+
+    def round_trips(self) -> int:
+        """Number of browser round-trips recorded."""
+        return sum(len(timings) for (kind, _), timings in self.timings.items() if kind == ROUND_TRIP)
+
+    def totals(self, kind: str) -> dict:
+        """{name: total seconds} for one kind of timed work."""
+        return {name: sum(timings) / 1000 for (timing_kind, name), timings in self.timings.items() if timing_kind == kind}
+
+    def summary_table(self) -> str:
+        """Table of every phase and round-trip (count, total, mean, max, timeouts, errors), then the counters."""
+        lines = [f"{'kind':<11} {'name':<24} {'n':>5} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'timeouts':>9} {'errors':>7}"]
+        for (kind, name), timings in sorted(self.timings.items(), key=lambda item: (item[0][0], -sum(item[1]))):
+            outcomes = self.outcomes[kind, name]
+            lines.append(
+                f"{kind:<11} {name:<24} {len(timings):>5} {sum(timings) / 1000:>9.2f} "
+                f"{sum(timings) / len(timings):>9.0f} {max(timings):>9.0f} {outcomes['timeout']:>9} {outcomes['error']:>7}"
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{'counter':<11} {name:<24} {value:>5}")
+        return "\n".join(lines)
+
+    def write_prometheus(self, path: str, prefix: str = "soccer24_scraper"):
+        """Write the metrics in Prometheus textfile-collector format (atomically, as the collector expects)."""
+        lines = [
+            f"# TYPE {prefix}_seconds summary",
+        ]
+        for (kind, name), timings in sorted(self.timings.items()):
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            lines.append(f"{prefix}_seconds_sum{{{labels}}} {sum(timings) / 1000:.6f}")
+            lines.append(f"{prefix}_seconds_count{{{labels}}} {len(timings)}")
+        lines.append(f"# TYPE {prefix}_outcomes_total counter")
+        for (kind, name), outcomes in sorted(self.outcomes.items()):
+            for outcome, value in sorted(outcomes.items()):
+                lines.append(f'{prefix}_outcomes_total{{kind="{kind}",name="{_escape(name)}",outcome="{outcome}"}} {value}')
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'{prefix}_events_total{{name="{_escape(name)}"}} {value}')
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_text_atomic(path, "\n".join(lines) + "\n")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+class JsonLinesSink:
+    """Appends every metrics event to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, event: dict):
+        self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+# Metrics of the current process
+METRICS = Metrics()
+
+def add_metrics_arguments(parser):
+    """Add the metrics output options to a command line parser."""
+    parser.add_argument("--metrics-jsonl", help="Append every timing/counter event to this JSON-lines file")
+    parser.add_argument("--metrics-prom", help="Write a Prometheus textfile with the run's metrics at the end")
+
+def metrics_from_args(args):
+    """Attach the sinks selected by add_metrics_arguments options to METRICS. Returns the opened sinks."""
+    sinks = []
+    if args.metrics_jsonl:
+        sinks.append(JsonLinesSink(args.metrics_jsonl))
+    METRICS.sinks.extend(sinks)
+    return sinks
+
+def finish_metrics(args, sinks):
+    """Write the Prometheus textfile (if requested) and close the sinks."""
+    if args.metrics_prom:
+        METRICS.write_prometheus(args.metrics_prom)
+    for sink in sinks:
+        METRICS.sinks.remove(sink)
+        sink.close()
@@ -1,339 +1,666 @@
-import json
+import argparse
+import asyncio
 import os
-import re  # For sanitizing filenames
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from dataclasses import asdict, dataclass, field
+from instrumentation import METRICS, add_metrics_arguments, finish_metrics, metrics_from_args
+from extractors import (FIRST_HALF_FIELDS, FULL_TIME_FIELDS, H2H_ROWS_JS, STATS_ROW_SELECTOR, extract_h2h_rows,
+                        extract_header, extract_stats, h2h_row_locator, h2h_section_locator)
+from checkpoint import COMPLETE, FAILED, PARTIAL, Checkpoint
+from feeds import FIRST_HALF_PERIOD, FULL_TIME_PERIOD, parse_statistics_feed, stats_feed_match_id
+from export import export_runs
+from match_cache import CACHE_PATH, MatchCache, match_id_from_link
+from match_stats import MatchStats, as_json
+from page_pool import PagePool
+from resource_policy import ResourcePolicy
+from output_writer import OutputWriter, league_from_url
+from save_to_json import DataStructure, HomeTeam, RecentMatches
+from scheduler import NavigationError, NavigationScheduler, add_scheduler_arguments, scheduler_from_args
+
+# Fixtures page and round scraped by default
+FIXTURES_URL = "https://www.soccer24.com/england/premier-league/fixtures/"
+ROUND_NAME = "Round 8"
+
+# Number of fixtures scraped at the same time (each one gets its own browser context)
+MAX_CONCURRENT_FIXTURES = 4
+# Number of reusable match-detail pages, shared by all fixtures
+MAX_CONCURRENT_DETAILS = 8
+
+# Site the match-statistics URLs are built on when no fixture link is at hand
+SITE_URL = "https://www.soccer24.com"
+
+# Upper bound (ms) for every readiness wait; waits return as soon as the content exists
+WAIT_TIMEOUT_MS = 15000
+# Upper bound (ms) for the optional Stats tab, which old matches may not have
+TAB_TIMEOUT_MS = 3000
+
+# Tab bar of a match page (its H2H tab is always there) and its Stats tab link
+TAB_BAR_SELECTOR = 'a[href*="#/h2h"] button[data-testid="wcl-tab"]'
+STATS_TAB_SELECTOR = 'a[href*="#/match-summary/match-statistics"]'
+
+# Number of H2H matches scraped per fixture (the most recent ones)
+MAX_H2H_MATCHES = 5
+
+# Directory of the per-team recent-matches files (one DataStructure file per team)
+RECENT_DIR = os.path.join("output", "recent")
+
+# Joined text of all rows matching a selector ("" when there are none)
+ROWS_TEXT_JS = "(selector) => Array.from(document.querySelectorAll(selector), (row) => row.innerText).join('\\n')"
 
 # Define the data structures to match the desired JSON format
-@dataclass
-class HeadToHead:
-    teams: dict = field(default_factory=dict)
-    goals: dict = field(default_factory=dict)
-    x_goals: dict = field(default_factory=dict)
-    corners: dict = field(default_factory=dict)
-    fouls: dict = field(default_factory=dict)
-    HT_cards: dict = field(default_factory=dict)
-    FT_cards: dict = field(default_factory=dict)
+class HeadToHead(MatchStats):
+    """H2H matches of a fixture, saved as teams/goals/x_goals/... dicts keyed by match_one, match_two, ..."""
+    __slots__ = ()
+
+class H2HTimeoutError(Exception):
+    """The H2H tab of a fixture did not load in time; the only fixture failure worth retrying."""
 
 @dataclass
 class FixtureData:
     fixture: str
     head_to_head: HeadToHead
 
-def save_to_json(data: FixtureData, filename: str):
-    """Save data as JSON file with sanitized filename."""
-    if not os.path.exists("output"):
-        os.makedirs("output")
-    # Sanitize filename by removing invalid characters
-    sanitized_filename = re.sub(r'[\\/:"*?<>|]+', "", filename)
-    with open(f"output/{sanitized_filename}.json", "w", encoding='utf-8') as file:
-        json.dump(asdict(data), file, indent=4, ensure_ascii=False)
+@dataclass
+class MatchDetail:
+    """Stats scraped from a single H2H match-detail page."""
+    teams: list = field(default_factory=list)
+    goals: list = field(default_factory=list)
+    x_goals: list = field(default_factory=list)
+    corners: list = field(default_factory=list)
+    fouls: list = field(default_factory=list)
+    HT_cards: list = field(default_factory=list)
+    FT_cards: list = field(default_factory=list)
+    # False when a step timed out or failed, so the result is not cached (a match whose tab bar has no Stats tab is complete)
+    complete: bool = True
+    # True when the match tabs or statistics timed out, so the match is worth scraping again
+    timed_out: bool = False
+
+    def to_cache(self) -> dict:
+        """Return the stats as a plain dict for the match cache."""
+        data = asdict(self)
+        del data["complete"]
+        del data["timed_out"]
+        return data
+
+def print_run_summary(policy: ResourcePolicy = None, checkpoint: Checkpoint = None):
+    """Print the phase and round-trip timings, counters, blocked requests and checkpoint counts of a run."""
+    print(METRICS.summary_table())
+    if policy:
+        print(policy.summary())
+    if checkpoint:
+        print(f"Checkpoint: {checkpoint.counts()}")
+
+async def get_round_links(page, round_name: str):
+    """Return the match links listed under round_name, or None if the round is not on the page."""
+    # Locate the specific div containing the round title, then
+    # find all sibling divs after it containing match data
+    return await METRICS.timed("round links", page.evaluate("""
+        (roundName) => {
+            const roundDiv = document.evaluate(
+                `//div[contains(text(),"${roundName}")]`, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+            if (!roundDiv) {
+                return null;
+            }
+            let links = [];
+            let nextSibling = roundDiv.nextElementSibling;
+            while (nextSibling && nextSibling.classList.contains('event__match')) {
+                let linkElement = nextSibling.querySelector('a.eventRowLink');
+                if (linkElement) {
+                    links.push(linkElement.href);
+                }
+                nextSibling = nextSibling.nextElementSibling;
+            }
+            return links;
+        }
+    """, round_name))
+
+def apply_stats(detail: MatchDetail, stats: dict, fields: dict):
+    """Copy the statistics listed in fields from an extract_stats result into detail."""
+    for category, (attribute, convert) in fields.items():
+        if category not in stats:
+            continue
+        home_value_text, away_value_text = stats[category]
+        try:
+            setattr(detail, attribute, [convert(home_value_text), convert(away_value_text)])
+            print(f"{attribute} = {getattr(detail, attribute)}")
+        except ValueError:
+            print(f"Error converting {category} values: '{home_value_text}', '{away_value_text}'")
+
+def match_statistics_url(match_id: str, period: int = 0, site_url: str = SITE_URL) -> str:
+    """URL of a match's statistics tab; period 0 is the full match and 1 the 1st half."""
+    return f"{site_url}/match/{match_id}/#/match-summary/match-statistics/{period}"
+
+async def stats_from_feed(stats_feed: asyncio.Future, timeout: float = WAIT_TIMEOUT_MS):
+    """Statistics parsed from the captured statistics feed response, or None if it did not arrive in timeout ms or parse."""
+    try:
+        response = await METRICS.timed("stats feed", asyncio.wait_for(stats_feed, timeout / 1000))
+        periods = parse_statistics_feed(await response.text())
+    except Exception as e:
+        print(f"Statistics feed not available ({e or type(e).__name__}); reading the rendered statistics.")
+        return None
+    return periods if FULL_TIME_PERIOD in periods else None
+
+async def scrape_match_detail(page, match_id: str, site_url: str = SITE_URL, scheduler: NavigationScheduler = None,
+                              use_feeds: bool = True, wait_timeout: float = WAIT_TIMEOUT_MS) -> MatchDetail:
+    """Load a match's statistics URLs in page and extract teams, score, full-time stats and 1st half cards.
+
+    With use_feeds, the statistics are read from the statistics feed the page fetches (every
+    period at once), and the rendered Stats tab only when that feed is missing or unreadable.
+    """
+    stats_feed = None
+    if use_feeds:
+        # A listener has no timeout of its own, so time spent waiting for the scheduler or in a slow
+        # navigation cannot use up the feed wait; that wait only starts once the page has loaded
+        stats_feed = asyncio.get_running_loop().create_future()
+
+        def on_response(response):
+            if not stats_feed.done() and stats_feed_match_id(response.url) == match_id:
+                stats_feed.set_result(response)
+
+        page.on("response", on_response)
+    try:
+        return await read_match_detail(page, match_id, site_url, scheduler or NavigationScheduler(), stats_feed,
+                                       wait_timeout)
+    finally:
+        if stats_feed:
+            page.remove_listener("response", on_response)
+            stats_feed.cancel()
+
+async def read_match_detail(page, match_id: str, site_url: str, scheduler: NavigationScheduler,
+                            stats_feed: asyncio.Future = None, wait_timeout: float = WAIT_TIMEOUT_MS) -> MatchDetail:
+    """Body of scrape_match_detail; stats_feed is the pending statistics feed response, if listened for."""
+    detail = MatchDetail()
+
+    # Go straight to the full-match statistics instead of clicking through the summary
+    await scheduler.goto(page, match_statistics_url(match_id, 0, site_url), "goto stats", wait_until="domcontentloaded")
+
+    # Wait until the match header is rendered
+    await METRICS.timed("match header", page.wait_for_selector('div.duelParticipant__away a.participant__participantName'))
+
+    # Extract team names and score in one round-trip
+    header = await METRICS.timed("extract header", extract_header(page))
+    if header["score"]:
+        try:
+            detail.goals = [int(header["score"][0]), int(header["score"][1])]
+            print(f"goals = {detail.goals}")
+        except ValueError as e:
+            print(f"Error extracting goals: {e}")
+            detail.complete = False
+    else:
+        print("Could not extract score.")
+        detail.complete = False
+
+    if header["home"] and header["away"]:
+        detail.teams = [header["home"], header["away"]]
+        print(f"Teams: {detail.teams}")
+    else:
+        print("Could not extract team names.")
+        detail.complete = False
+
+    # **Extract x_goals, corner kicks, fouls, and FT_cards from the stats section**
+    # Every period is in the feed, so neither the rendered rows nor the 1st Half tab are needed.
+    # It usually arrives with the page; when it does, the Stats tab is not waited for at all.
+    periods = None
+    if stats_feed:
+        await asyncio.wait([stats_feed], timeout=TAB_TIMEOUT_MS / 1000)
+        if stats_feed.done():
+            periods = await stats_from_feed(stats_feed, wait_timeout)
+    if periods is None:
+        try:
+            await METRICS.timed("stats tab", page.wait_for_selector(STATS_TAB_SELECTOR, timeout=TAB_TIMEOUT_MS))
+        except PlaywrightTimeoutError:
+            # Old and some cup matches have no Stats tab at all. Only a rendered tab bar without the
+            # link shows that; a page that is merely slow stays incomplete, so it is retried and not cached.
+            try:
+                await METRICS.timed("tab bar", page.wait_for_selector(TAB_BAR_SELECTOR))
+            except PlaywrightTimeoutError:
+                print("Match tabs did not render in time.")
+                detail.complete = False
+                detail.timed_out = True
+                return detail
+            if not await METRICS.timed("stats tab", page.locator(STATS_TAB_SELECTOR).count()):
+                print("No Stats tab; the match has no statistics.")
+                METRICS.count("matches without stats")
+                return detail
+        if stats_feed and not stats_feed.done():
+            periods = await stats_from_feed(stats_feed, wait_timeout)
+    try:
+        with METRICS.phase("stats tab", match_id=match_id):
+            if periods:
+                METRICS.count("stats from feed")
+                apply_stats(detail, periods[FULL_TIME_PERIOD], FULL_TIME_FIELDS)
+                apply_stats(detail, periods.get(FIRST_HALF_PERIOD, {}), FIRST_HALF_FIELDS)
+                if not detail.HT_cards:
+                    print("Could not extract HT_cards values.")
+                return detail
+            METRICS.count("stats from DOM")
+
+            # Wait for the first statistics row of the Stats section
+            await METRICS.timed("stats rows", page.wait_for_selector(STATS_ROW_SELECTOR))
+
+            full_time_stats = await METRICS.timed("extract stats", extract_stats(page))
+            apply_stats(detail, full_time_stats, FULL_TIME_FIELDS)
+    except PlaywrightTimeoutError:
+        print("Stats not found or failed to load in time.")
+        detail.complete = False
+        detail.timed_out = True
+    except Exception as e:
+        print(f"An error occurred while loading the Stats section: {e}")
+        detail.complete = False
+
+    # **Extract HT_cards (Yellow Cards in 1st Half)**
+    try:
+        with METRICS.phase("1st half tab", match_id=match_id):
+            # The full-time rows stay in the DOM, so wait for the rows to change rather than to exist
+            full_time_rows = await METRICS.timed("snapshot stats rows", page.evaluate(ROWS_TEXT_JS, STATS_ROW_SELECTOR))
+
+            # The period links render together with the full-time rows; without them there is no 1st Half view
+            first_half_links = page.locator('a[href*="#/match-summary/match-statistics/1"]')
+            if not full_time_rows or not await METRICS.timed("1st half link", first_half_links.count()):
+                print("1st Half stats not available.")
+                return detail
+
+            # Switch period with a same-document hash change on the (possibly redirected) match URL
+            await METRICS.timed("goto 1st half", page.goto(page.url.split("#")[0] + "#/match-summary/match-statistics/1"))
+
+            # A timeout here leaves HT_cards empty: the rows on screen would still be the full-time ones
+            await METRICS.timed("1st half rows", page.wait_for_function(
+                f"([selector, before]) => ({ROWS_TEXT_JS})(selector) && ({ROWS_TEXT_JS})(selector) !== before",
+                arg=[STATS_ROW_SELECTOR, full_time_rows],
+            ))
+
+            first_half_stats = await METRICS.timed("extract 1st half stats", extract_stats(page))
+            apply_stats(detail, first_half_stats, FIRST_HALF_FIELDS)
+            if not detail.HT_cards:
+                print("Could not extract HT_cards values.")
+    except PlaywrightTimeoutError:
+        print("1st Half stats failed to load in time.")
+        detail.complete = False
+        detail.timed_out = True
+    except Exception as e:
+        print(f"An error occurred while loading the 1st Half stats: {e}")
+        detail.complete = False
+
+    return detail
+
+async def scrape_detail(pool: PagePool, match_id: str, row_title: str, cache: MatchCache = None,
+                        site_url: str = SITE_URL, scheduler: NavigationScheduler = None,
+                        use_feeds: bool = True, wait_timeout: float = WAIT_TIMEOUT_MS) -> MatchDetail:
+    """Return the detail of one H2H match from the cache, or scrape it in a pooled page."""
+    if match_id is None:
+        print(f"Could not find the match id of: {row_title}")
+        return MatchDetail(complete=False)
+
+    # Finished matches never change, so a cached detail skips the browser entirely
+    cached = cache.get(match_id) if cache else None
+    if cached is not None:
+        print(f"Cache hit for match detail: {row_title} ({match_id})")
+        METRICS.count("cache hits")
+        return MatchDetail(**cached)
+    if cache:
+        METRICS.count("cache misses")
+
+    scheduler = scheduler or NavigationScheduler()
+    # Statistics that timed out are retried after a backoff; other failures would fail the same way again
+    for attempt in range(scheduler.retries + 1):
+        if attempt:
+            delay = scheduler.backoff(attempt)
+            print(f"Retrying match detail {row_title} ({attempt}/{scheduler.retries}) in {delay:.1f} s")
+            METRICS.count("retries", label="match detail")
+            await asyncio.sleep(delay)
+        page = await pool.acquire()
+        try:
+            with METRICS.phase("match detail", match_id=match_id):
+                detail = await scrape_match_detail(page, match_id, site_url, scheduler, use_feeds, wait_timeout)
+        except Exception as e:
+            print(f"An error occurred while scraping match detail {row_title}: {e}")
+            return MatchDetail(complete=False)
+        finally:
+            pool.release(page)
+            print(f"Scraped match detail: {row_title}")
+        if not detail.timed_out:
+            break
+
+    if not detail.complete:
+        METRICS.count("partial details")
+    if cache and detail.complete:
+        cache.put(match_id, detail.to_cache())
+    return detail
+
+async def match_id_from_popup(page, row_index: int, section_title: str = "Head-to-head matches"):
+    """Fallback for H2H rows without a link: click the row and read the match id from the tab it opens."""
+    try:
+        async with page.context.expect_page() as new_page_event:
+            await h2h_row_locator(page, row_index, section_title).click()  # Click on the H2H match detail
+        new_page = await new_page_event.value  # The newly opened page
+    except PlaywrightTimeoutError:
+        print("H2H row did not open a match-detail tab.")
+        return None
+    try:
+        await new_page.wait_for_url(lambda url: match_id_from_link(url) is not None, wait_until="commit")
+        return match_id_from_link(new_page.url)
+    except PlaywrightTimeoutError:
+        print(f"No match id in the match-detail tab URL: {new_page.url}")
+        return None
+    finally:
+        await new_page.close()
 
-def main():
-    with sync_playwright() as p:
+@dataclass
+class Session:
+    """Browser-wide state shared by every fixture scraped in a run, or in a batch of runs."""
+    browser: object
+    pool: PagePool = None
+    cache: MatchCache = None
+    policy: ResourcePolicy = None
+    wait_timeout: float = WAIT_TIMEOUT_MS
+    # Recorder or Replayer from replay.py, to capture the site's responses or serve them offline
+    recording: object = None
+    # Last matches scraped per team of every fixture (0 to skip recent form), and where they are saved
+    recent_matches: int = 0
+    recent_dir: str = RECENT_DIR
+    # Match-detail tasks by match id, so a match in several H2H or recent-form lists is loaded once
+    details: dict = field(default_factory=dict)
+    # Teams whose recent form was claimed by a fixture, so each team is scraped once per session
+    teams: set = field(default_factory=set)
+    # Writer of the recent-form files, created with the first one
+    recent_writer: OutputWriter = None
+    # Rate limit, adaptive concurrency and retries of every navigation
+    scheduler: NavigationScheduler = field(default_factory=NavigationScheduler)
+    # Read match statistics from the site's feeds (False: only from the rendered page)
+    feeds: bool = True
+
+    async def new_context(self):
+        """Open a browser context with the wait upper bound, recording and resource policy applied."""
+        context = await self.browser.new_context()
+        context.on("page", lambda page: METRICS.count("pages opened"))
+        # Upper bound for every wait in this context
+        context.set_default_timeout(self.wait_timeout)
+        # Installed first so the policy's route handler runs before it and only lets allowed requests through
+        if self.recording:
+            await self.recording.install(context)
+        # Skip images, fonts, ads and trackers
+        if self.policy:
+            await self.policy.install(context)
+        return context
+
+    def end_job(self):
+        """Forget the claimed teams and the detail tasks of finished jobs, so a long-lived session retries them."""
+        self.teams.clear()
+        self.details.clear()
+
+    def match_detail(self, match_id: str, row_title: str, site_url: str = SITE_URL) -> asyncio.Future:
+        """Future of a match's detail, scraped (or read from the cache) at most once per session."""
+        if match_id is None:
+            return asyncio.ensure_future(scrape_detail(self.pool, None, row_title))
+        if match_id not in self.details:
+            self.details[match_id] = asyncio.ensure_future(
+                scrape_detail(self.pool, match_id, row_title, self.cache, site_url, self.scheduler, self.feeds,
+                              self.wait_timeout))
+        return self.details[match_id]
+
+async def open_session(browser, max_details: int = MAX_CONCURRENT_DETAILS, cache: MatchCache = None,
+                       wait_timeout: float = WAIT_TIMEOUT_MS, policy: ResourcePolicy = None,
+                       recording=None, recent_matches: int = 0, recent_dir: str = RECENT_DIR,
+                       scheduler: NavigationScheduler = None, feeds: bool = True) -> Session:
+    """Create a Session whose match-detail page pool is shared by every fixture scraped with it."""
+    session = Session(browser, cache=cache, policy=policy, wait_timeout=wait_timeout, recording=recording,
+                      recent_matches=recent_matches, recent_dir=recent_dir,
+                      scheduler=scheduler or NavigationScheduler(), feeds=feeds)
+    session.pool = PagePool(await session.new_context(), max_details)
+    return session
+
+async def extract_recent_rows(page, team: str, count: int):
+    """Rows of the "Last matches: <team>" section of the H2H tab, showing more until there are count rows."""
+    section_title = f"Last matches: {team}"
+    rows = await METRICS.timed("extract recent rows", extract_h2h_rows(page, section_title))
+    while rows is not None and len(rows) < count:
+        show_more = h2h_section_locator(page, section_title).get_by_text("Show more matches")
+        if not await METRICS.timed("show more", show_more.count()):
+            break
+        await METRICS.timed("show more", show_more.first.click())
         try:
-            # Launch browser
-            browser = p.chromium.launch(headless=True)  # Set headless=True for faster performance
-            page = browser.new_page()
+            await METRICS.timed("recent rows", page.wait_for_function(
+                f"([title, shown]) => (({H2H_ROWS_JS})(title) || []).length > shown", arg=[section_title, len(rows)],
+            ))
+        except PlaywrightTimeoutError:
+            break
+        rows = await METRICS.timed("extract recent rows", extract_h2h_rows(page, section_title))
+    return rows[:count] if rows is not None else None
+
+async def scrape_recent_form(session: Session, team: str, matches, site_url: str = SITE_URL) -> DataStructure:
+    """Scrape the (match id, row title) matches of a team's recent form and save them as a DataStructure file."""
+    with METRICS.phase("recent form", team=team):
+        # Shared with the H2H path: a match already loaded for any fixture is not loaded again
+        details = await asyncio.gather(*(session.match_detail(match_id, row_title, site_url)
+                                         for match_id, row_title in matches))
+        recent_matches = RecentMatches()
+        for detail in details:
+            recent_matches.add_match(detail)
+        data = DataStructure(home_team=HomeTeam(name=team, recent_matches=recent_matches))
+        if session.recent_writer is None:
+            session.recent_writer = OutputWriter(session.recent_dir)
+        session.recent_writer.write(as_json(data), team, team=team, match_ids=[match_id for match_id, _ in matches])
+    print(f"Saved recent form of {team}: {len(details)} matches")
+    return data
+
+async def claim_recent_form(session: Session, page, team: str, site_url: str = SITE_URL):
+    """Start scraping a team's recent form from the H2H tab in page, unless another fixture already did.
+
+    Returns the task, or None if the team was already claimed or has no "Last matches" section.
+    """
+    if team in session.teams:
+        return None
+    session.teams.add(team)
+    try:
+        rows = await extract_recent_rows(page, team, session.recent_matches)
+        if rows is None:
+            print(f"Last matches section not found for {team}.")
+            return None
+        # Match ids are read while the H2H tab is still open, for rows that need the popup fallback
+        matches = [(match_id_from_link(row["link"]) or await match_id_from_popup(page, row["index"], f"Last matches: {team}"),
+                    row["title"]) for row in rows]
+    except Exception as e:
+        print(f"An error occurred while reading the last matches of {team}: {e}")
+        # Left for another fixture of the same team to retry
+        session.teams.discard(team)
+        return None
+    return asyncio.ensure_future(scrape_recent_form(session, team, matches, site_url))
+
+async def scrape_fixture(session: Session, link: str, checkpoint: Checkpoint = None, output_dir: str = "output",
+                         writer: OutputWriter = None):
+    """Scrape the H2H data of one fixture link and save it with writer. Returns the FixtureData, or None if skipped."""
+    writer = writer or OutputWriter(output_dir)
+    site_url = "{0.scheme}://{0.netloc}".format(urlsplit(link))
+    context = await session.new_context()
+    try:
+        page = await context.new_page()
+        with METRICS.phase("fixture load", link=link):
+            await session.scheduler.goto(page, link, "goto fixture")
+            await METRICS.timed("fixture header", page.wait_for_selector('div.duelParticipant__away a.participant__participantName'))
+
+            # Extract the home team, away team, and divider ("-") in one round-trip
+            header = await METRICS.timed("extract header", extract_header(page))
+
+        if header["home"] and header["divider"] is not None and header["away"]:
+            # Store in variable 'fixture' and print
+            fixture = f"{header['home']} vs {header['away']}"
+            print(f"Fixture: {fixture}")
+        else:
+            print("Could not extract fixture details.")
+            return None  # Skip to the next link if fixture details are missing
+
+        # Initialize FixtureData instance
+        fixture_data = FixtureData(
+            fixture=fixture,
+            head_to_head=HeadToHead()
+        )
+
+        # Click on the "H2H" tab
+        try:
+            with METRICS.phase("h2h section", link=link):
+                # Ensure the selector accurately targets the H2H tab
+                await METRICS.timed("h2h tab click", page.click(TAB_BAR_SELECTOR))
+                await METRICS.timed("h2h rows", page.wait_for_selector('div.h2h__row'))  # Wait for H2H section to load
+
+                # Read the date, title and link of every row of the "Head-to-head matches" section
+                h2h_rows = await METRICS.timed("extract h2h rows", extract_h2h_rows(page))
+
+                if h2h_rows is None:
+                    print("Head-to-head matches section not found.")
+                    return None  # Skip to the next match link
+
+                # Filter h2h_rows to include only those with year >= 20
+                filtered_h2h_rows = []
+                for row in h2h_rows:
+                    date_text = row["date"]
+                    if date_text is not None:
+                        # Assuming date format is DD.MM.YY
+                        try:
+                            year = int(date_text.split('.')[-1])
+                            if year >= 20:
+                                filtered_h2h_rows.append(row)
+                                print(f"Including match from year: {year}")
+                            else:
+                                print(f"Excluding match from year: {year}")
+                        except ValueError:
+                            print(f"Invalid date format: {date_text}")
+                    else:
+                        print("Date element not found in h2h__row.")
+
+            # Scrape the match details concurrently in the shared page pool
+            # Limit to the first MAX_H2H_MATCHES matches if necessary
+            detail_tasks = []
+            match_ids = []
+            for row in filtered_h2h_rows[:MAX_H2H_MATCHES]:
+                row_title = row["title"]  # Optional: Get the title for logging
+
+                match_id = match_id_from_link(row["link"]) or await match_id_from_popup(page, row["index"])
+                match_ids.append(match_id)
+                detail_tasks.append(session.match_detail(match_id, row_title, site_url))
+
+            # Recent form of both teams, read from the same H2H tab
+            team_tasks = []
+            if session.recent_matches:
+                for team in (header["home"], header["away"]):
+                    team_task = await claim_recent_form(session, page, team, site_url)
+                    if team_task:
+                        team_tasks.append(team_task)
+
+            # Keep match_one, match_two, ... in row order regardless of which detail finished first
+            details = await asyncio.gather(*detail_tasks)
+            for team_result in await asyncio.gather(*team_tasks, return_exceptions=True):
+                if isinstance(team_result, Exception):
+                    print(f"An error occurred while scraping recent form: {team_result}")
+            for detail in details:
+                fixture_data.head_to_head.add_match(detail)
+            status = COMPLETE if all(detail.complete for detail in details) else PARTIAL
 
+        except PlaywrightTimeoutError as e:
+            print("H2H tab not found or failed to click.")
+            raise H2HTimeoutError(f"H2H tab of {link} timed out") from e
+        except Exception as e:
+            print(f"An error occurred while processing H2H: {e}")
+            return None  # Skip to the next match link
+
+        # After collecting all head-to-head data, save to JSON
+        with METRICS.phase("save", link=link):
+            path = writer.write(as_json(fixture_data), fixture, fixture=fixture, date=header["date"],
+                                link=link, match_ids=match_ids)
+            if checkpoint:
+                checkpoint.record(link, status, fixture, path)
+        print(f"Saved data for fixture: {fixture} ({status})")
+        return fixture_data
+    finally:
+        await context.close()
+
+async def load_round_links(session: Session, fixtures_url: str, round_names) -> dict:
+    """Load a fixtures page once and return {round name: match links, or None if the round is not listed}."""
+    context = await session.new_context()
+    try:
+        page = await context.new_page()
+
+        with METRICS.phase("fixtures list", url=fixtures_url):
             # Base URL
-            page.goto("https://www.soccer24.com/england/premier-league/fixtures/", timeout=1800000)
-            page.wait_for_timeout(2000)  # Wait for the page to load completely
-
-            # Locate the specific div containing "Round 7"
-            round_7_div = page.query_selector('//div[contains(text(),"Round 8")]')
-
-            if round_7_div:
-                # Find all sibling divs after "Round 7" containing match data
-                match_links_handle = round_7_div.evaluate_handle(""" 
-                    (round7) => {
-                        let links = [];
-                        let nextSibling = round7.nextElementSibling;
-                        while (nextSibling && nextSibling.classList.contains('event__match')) {
-                            let linkElement = nextSibling.querySelector('a.eventRowLink');
-                            if (linkElement) {
-                                links.push(linkElement.href);
-                            }
-                            nextSibling = nextSibling.nextElementSibling;
-                        }
-                        return links;
-                    }
-                """)
-                links = match_links_handle.json_value()
-
-                # Iterate through each match link, click it, and extract the required text
-                for link in links:
-                    page.goto(link)
-
-                    # Extract the home team, away team, and divider ("-")
-                    home_team_element = page.query_selector('a.participant__participantName.participant__overflow')
-                    divider_element = page.query_selector('span.detailScore__divider')
-                    away_team_element = page.query_selector('div.duelParticipant__away a.participant__participantName.participant__overflow')
-
-                    if home_team_element and divider_element and away_team_element:
-                        home_team = home_team_element.inner_text().strip()
-                        divider = divider_element.inner_text().strip()
-                        away_team = away_team_element.inner_text().strip()
-
-                        # Store in variable 'fixture' and print
-                        fixture = f"{home_team} vs {away_team}"
-                        print(f"Fixture: {fixture}")
-                    else:
-                        print("Could not extract fixture details.")
-                        continue  # Skip to the next link if fixture details are missing
-
-                    # Initialize FixtureData instance
-                    fixture_data = FixtureData(
-                        fixture=fixture,
-                        head_to_head=HeadToHead()
-                    )
-
-                    # Click on the "H2H" tab
-                    try:
-                        # Ensure the selector accurately targets the H2H tab
-                        page.click('a[href*="#/h2h"] button[data-testid="wcl-tab"]')
-                        page.wait_for_timeout(2000)  # Wait for H2H section to load
-
-                        # Locate the "Head-to-head matches" section using XPath
-                        h2h_section = page.query_selector('//div[contains(@class, "h2h__section") and .//div[contains(@class, "section__title") and normalize-space(text())="Head-to-head matches"]]')
-
-                        if h2h_section:
-                            # Within this section, select all h2h__row divs
-                            h2h_rows = h2h_section.query_selector_all('div.h2h__row')
-
-                            # Filter h2h_rows to include only those with year >= 20
-                            filtered_h2h_rows = []
-                            for row in h2h_rows:
-                                date_element = row.query_selector('span.h2h__date')
-                                if date_element:
-                                    date_text = date_element.inner_text().strip()
-                                    # Assuming date format is DD.MM.YY
-                                    try:
-                                        year = int(date_text.split('.')[-1])
-                                        if year >= 20:
-                                            filtered_h2h_rows.append(row)
-                                            print(f"Including match from year: {year}")
-                                        else:
-                                            print(f"Excluding match from year: {year}")
-                                    except ValueError:
-                                        print(f"Invalid date format: {date_text}")
-                                else:
-                                    print("Date element not found in h2h__row.")
-                            
-                            # Now, use filtered_h2h_rows for further processing
-                            # Limit to first five matches if necessary
-                            for idx, row in enumerate(filtered_h2h_rows[:5], start=1):
-                                match_key = f"match_{['one','two','three','four','five'][idx-1]}"
-
-                                row_title = row.get_attribute('title')  # Optional: Get the title for logging
-                                row.click()  # Click on the H2H match detail
-                                print(f"Clicked on match detail: {row_title}")
-
-                                # Wait for the new page to open
-                                with page.context.expect_page() as new_page_event:
-                                    pass  # No action needed here; the context manager handles it
-
-                                new_page = new_page_event.value  # The newly opened page
-
-                                # Wait for the new page to load completely
-                                new_page.wait_for_load_state('domcontentloaded')
-
-                                # Extract team names 
-                                new_home_team_element = new_page.query_selector('div.duelParticipant__home a.participant__participantName.participant__overflow')
-                                new_away_team_element = new_page.query_selector('div.duelParticipant__away a.participant__participantName.participant__overflow')
-
-                                # Extract score
-                                score_element = new_page.query_selector('div.detailScore__wrapper')
-                                if score_element:
-                                    try:
-                                        score_spans = score_element.query_selector_all('span')
-                                        score_home = int(score_spans[0].inner_text().strip())
-                                        score_away = int(score_spans[2].inner_text().strip())
-                                        goals = [score_home, score_away]
-                                        fixture_data.head_to_head.goals[match_key] = goals
-                                        print(f"goals = {goals}")
-                                    except (IndexError, ValueError) as e:
-                                        print(f"Error extracting goals: {e}")
-                                        fixture_data.head_to_head.goals[match_key] = []
-                                else:
-                                    print("Could not extract score.")
-                                    fixture_data.head_to_head.goals[match_key] = []
-
-                                # Extract team names if available
-                                if new_home_team_element and new_away_team_element:
-                                    new_home_team = new_home_team_element.inner_text().strip()
-                                    new_away_team = new_away_team_element.inner_text().strip()
-                                    fixture_data.head_to_head.teams[match_key] = [new_home_team, new_away_team]
-                                    print(f"Teams: {[new_home_team, new_away_team]}")
-                                else:
-                                    print("Could not extract team names.")
-                                    fixture_data.head_to_head.teams[match_key] = []
-
-                                # **Extract x_goals, corner kicks, fouls, and FT_cards from the stats section**
-                                # Initialize statistics
-                                fixture_data.head_to_head.x_goals[match_key] = []
-                                fixture_data.head_to_head.corners[match_key] = []
-                                fixture_data.head_to_head.fouls[match_key] = []
-                                fixture_data.head_to_head.FT_cards[match_key] = []
-                                # **Initialize HT_cards to ensure it's always set, even if extraction fails**
-                                fixture_data.head_to_head.HT_cards[match_key] = []
-
-                                # Click on the "Stats" button
-                                try:
-                                    # Define the selector for the Stats button
-                                    stats_button_selector = 'a[href="#/match-summary/match-statistics"] button[data-testid="wcl-tab"]'
-
-                                    # Wait for the Stats button to be available and click it
-                                    stats_button = new_page.wait_for_selector(stats_button_selector, timeout=3000)
-                                    if stats_button:
-                                        stats_button.click()
-                                        print("Clicked on the Stats button.")
-
-                                        # Optionally, wait for the Stats section to load
-                                        new_page.wait_for_timeout(2000)  # Adjust the timeout as needed
-
-                                        # **Extract x_goals, corner kicks, fouls, and FT_cards from the stats section**
-                                        # Locate all statistics rows
-                                        stats_rows = new_page.query_selector_all('div._row_18zuy_8[data-testid="wcl-statistics"]')
-
-                                        for stat_row in stats_rows:
-                                            # Extract the category name
-                                            category_element = stat_row.query_selector('div._category_1haer_4 strong')
-                                            if not category_element:
-                                                continue  # Skip if category not found
-
-                                            category = category_element.inner_text().strip()
-
-                                            # Extract home and away values
-                                            home_value_element = stat_row.query_selector('div._value_7ptpb_4._homeValue_7ptpb_9[data-testid="wcl-statistics-value"] strong')
-                                            away_value_element = stat_row.query_selector('div._value_7ptpb_4._awayValue_7ptpb_13[data-testid="wcl-statistics-value"] strong')
-
-                                            if home_value_element and away_value_element:
-                                                home_value_text = home_value_element.inner_text().strip()
-                                                away_value_text = away_value_element.inner_text().strip()
-
-                                                if category == "Expected Goals (xG)":
-                                                    try:
-                                                        home_xg = float(home_value_text)
-                                                        away_xg = float(away_value_text)
-                                                        fixture_data.head_to_head.x_goals[match_key] = [home_xg, away_xg]
-                                                        print(f"x_goals = {[home_xg, away_xg]}")
-                                                    except ValueError:
-                                                        print(f"Error converting xG values: '{home_value_text}', '{away_value_text}'")
-                                                        fixture_data.head_to_head.x_goals[match_key] = []
-
-                                                elif category == "Corner Kicks":
-                                                    try:
-                                                        home_corners = int(home_value_text)
-                                                        away_corners = int(away_value_text)
-                                                        fixture_data.head_to_head.corners[match_key] = [home_corners, away_corners]
-                                                        print(f"corners = {[home_corners, away_corners]}")
-                                                    except ValueError:
-                                                        print(f"Error converting Corner Kick values: '{home_value_text}', '{away_value_text}'")
-                                                        fixture_data.head_to_head.corners[match_key] = []
-
-                                                elif category == "Fouls":
-                                                    try:
-                                                        home_fouls = int(home_value_text)
-                                                        away_fouls = int(away_value_text)
-                                                        fixture_data.head_to_head.fouls[match_key] = [home_fouls, away_fouls]
-                                                        print(f"fouls = {[home_fouls, away_fouls]}")
-                                                    except ValueError:
-                                                        print(f"Error converting Fouls values: '{home_value_text}', '{away_value_text}'")
-                                                        fixture_data.head_to_head.fouls[match_key] = []
-
-                                                elif category == "Yellow Cards":
-                                                    try:
-                                                        home_cards = int(home_value_text)
-                                                        away_cards = int(away_value_text)
-                                                        fixture_data.head_to_head.FT_cards[match_key] = [home_cards, away_cards]
-                                                        print(f"FT_cards = {[home_cards, away_cards]}")
-                                                    except ValueError:
-                                                        print(f"Error converting Yellow Cards values: '{home_value_text}', '{away_value_text}'")
-                                                        fixture_data.head_to_head.FT_cards[match_key] = []
-
-                                except PlaywrightTimeoutError:
-                                    print("Stats button not found or failed to load in time.")
-                                except Exception as e:
-                                    print(f"An error occurred while clicking the Stats button: {e}")
-                                # **Extract HT_cards (Yellow Cards in 1st Half)**
-                                try:
-                                    # Define the selector for the "1st Half" button
-                                    first_half_button_selector = 'a[title="1st Half"] button[data-testid="wcl-tab"]'
-
-                                    # Wait for the "1st Half" button to be available and click it
-                                    first_half_button = new_page.wait_for_selector(first_half_button_selector, timeout=3000)
-                                    if first_half_button:
-                                        first_half_button.click()
-                                        print("Clicked on the 1st Half button.")
-
-                                        # Optionally, wait for the 1st Half stats to load
-                                        new_page.wait_for_timeout(2000)  # Adjust the timeout as needed
-
-                                        # **Extract HT_cards (Yellow Cards in 1st Half)**
-                                        # Locate all statistics rows in 1st Half
-                                        first_half_stats_rows = new_page.query_selector_all('div._row_18zuy_8[data-testid="wcl-statistics"]')
-
-                                        for fh_stat_row in first_half_stats_rows:
-                                            # Extract the category name
-                                            fh_category_element = fh_stat_row.query_selector('div._category_1haer_4 strong')
-                                            if not fh_category_element:
-                                                continue  # Skip if category not found
-
-                                            fh_category = fh_category_element.inner_text().strip()
-
-                                            if fh_category == "Yellow Cards":
-                                                # Extract home and away values
-                                                fh_home_value_element = fh_stat_row.query_selector('div._value_7ptpb_4._homeValue_7ptpb_9[data-testid="wcl-statistics-value"] strong')
-                                                fh_away_value_element = fh_stat_row.query_selector('div._value_7ptpb_4._awayValue_7ptpb_13[data-testid="wcl-statistics-value"] strong')
-
-                                                if fh_home_value_element and fh_away_value_element:
-                                                    fh_home_value_text = fh_home_value_element.inner_text().strip()
-                                                    fh_away_value_text = fh_away_value_element.inner_text().strip()
-
-                                                    try:
-                                                        home_ht_cards = int(fh_home_value_text)
-                                                        away_ht_cards = int(fh_away_value_text)
-                                                        fixture_data.head_to_head.HT_cards[match_key] = [home_ht_cards, away_ht_cards]
-                                                        print(f"HT_cards = {[home_ht_cards, away_ht_cards]}")
-                                                    except ValueError:
-                                                        print(f"Error converting HT_cards values: '{fh_home_value_text}', '{fh_away_value_text}'")
-                                                        # HT_cards[match_key] is already initialized to [] before extraction
-                                                else:
-                                                    print("Could not extract HT_cards values.")
-                                                    # HT_cards[match_key] is already initialized to []
-                                    else:
-                                        print("1st Half button not found.")
-                                        # HT_cards[match_key] remains as [] (initialized earlier)
-                                except PlaywrightTimeoutError:
-                                    print("1st Half button not found or failed to load in time.")
-                                    # HT_cards[match_key] remains as [] (initialized earlier)
-                                except Exception as e:
-                                    print(f"An error occurred while clicking the 1st Half button: {e}")
-                                    # HT_cards[match_key] remains as [] (initialized earlier)
-
-                                # Close the new page after processing
-                                new_page.close()
-                                print(f"Closed tab after scraping match detail: {row_title}")
-
-                                # Wait before continuing to the next row
-                                page.wait_for_timeout(1000)  # Wait for the H2H section to reload
-
-                        else:
-                            print("Head-to-head matches section not found.")
-                            continue  # Skip to the next match link
-                    except PlaywrightTimeoutError:
-                        print("H2H tab not found or failed to click.")
-                        continue  # Skip to the next match link
-                    except Exception as e:
-                        print(f"An error occurred while processing H2H: {e}")
-                        continue  # Skip to the next match link
-
-                    # After collecting all head-to-head data, save to JSON
-                    save_to_json(fixture_data, fixture)
-                    print(f"Saved data for fixture: {fixture}")
-            else:
-                print("Round 7 not found.")
+            await session.scheduler.goto(page, fixtures_url, "goto fixtures list")
+            await METRICS.timed("fixtures list", page.wait_for_selector('div.event__match'))  # Wait for the fixtures to render
+
+            return {round_name: await get_round_links(page, round_name) for round_name in round_names}
+    finally:
+        await context.close()
+
+async def scrape_links(session: Session, links, fixture_slots: asyncio.Semaphore, checkpoint: Checkpoint = None,
+                       incremental: bool = False, output_dir: str = "output", writer: OutputWriter = None):
+    """Scrape fixture links concurrently, at most fixture_slots at a time. Returns the list of saved FixtureData.
+
+    With incremental=True, links the checkpoint lists as complete (and whose file
+    is unchanged) are skipped, so only new, failed or partial fixtures are scraped.
+    """
+    if incremental and checkpoint:
+        pending = [link for link in links if not checkpoint.is_done(link)]
+        print(f"Skipping {len(links) - len(pending)} completed fixtures, {len(pending)} left.")
+        links = pending
+    writer = writer or OutputWriter(output_dir)
+
+    async def fixture_worker(link):
+        async with fixture_slots:
+            fixture_data = None
+            # Only an H2H tab timeout is retried: navigations were already retried by the scheduler,
+            # and a fixture without details or an H2H section fails the same way every time
+            for attempt in range(session.scheduler.retries + 1):
+                if attempt:
+                    delay = session.scheduler.backoff(attempt)
+                    print(f"Retrying {link} ({attempt}/{session.scheduler.retries}) in {delay:.1f} s")
+                    METRICS.count("retries", label="fixture")
+                    await asyncio.sleep(delay)
+                try:
+                    fixture_data = await scrape_fixture(session, link, checkpoint, output_dir, writer)
+                except H2HTimeoutError as e:
+                    print(f"{e}.")
+                    continue
+                except NavigationError as e:
+                    print(f"Navigation to {link} failed after every retry: {e}")
+                except PlaywrightTimeoutError as e:
+                    print(f"Playwright Timeout Error on {link}: {e}")
+                except Exception as e:
+                    print(f"An unexpected error occurred on {link}: {e}")
+                break
+            if fixture_data is None and checkpoint:
+                checkpoint.record(link, FAILED)
+            return fixture_data
+
+    results = await asyncio.gather(*(fixture_worker(link) for link in links))
+    return [fixture_data for fixture_data in results if fixture_data]
+
+async def run(fixtures_url: str = FIXTURES_URL, round_name: str = ROUND_NAME,
+              max_fixtures: int = MAX_CONCURRENT_FIXTURES, max_details: int = MAX_CONCURRENT_DETAILS,
+              cache: MatchCache = None, wait_timeout: float = WAIT_TIMEOUT_MS, policy: ResourcePolicy = None,
+              checkpoint: Checkpoint = None, incremental: bool = False, output_dir: str = "output",
+              recording=None, recent_matches: int = 0, recent_dir: str = RECENT_DIR,
+              scheduler: NavigationScheduler = None, jsonl: bool = False, feeds: bool = True):
+    """Scrape every fixture of round_name concurrently. Returns the list of saved FixtureData.
+
+    With jsonl=True, every fixture is also appended to one JSON Lines file of the run in output_dir.
+    """
+    async with async_playwright() as p:
+        # Launch browser
+        browser = await p.chromium.launch(headless=True)  # Set headless=True for faster performance
+        try:
+            session = await open_session(browser, max_details, cache, wait_timeout, policy, recording,
+                                         recent_matches, recent_dir, scheduler, feeds)
+
+            links = (await load_round_links(session, fixtures_url, [round_name]))[round_name]
+            if links is None:
+                print(f"{round_name} not found.")
+                return []
+
+            writer = OutputWriter(output_dir, jsonl, league_from_url(fixtures_url), round_name)
+            try:
+                return await scrape_links(session, links, asyncio.Semaphore(max_fixtures), checkpoint, incremental,
+                                          output_dir, writer)
+            finally:
+                writer.close()
 
         except PlaywrightTimeoutError as e:
             print(f"Playwright Timeout Error: {e}")
@@ -341,7 +668,60 @@ def main():
             print(f"An unexpected error occurred: {e}")
         finally:
             # Close browser instance when the job is done
-            browser.close()
+            await browser.close()
+            print_run_summary(policy, checkpoint)
+        return []
+
+def add_policy_arguments(parser: argparse.ArgumentParser):
+    """Add the resource-blocking options to a command line parser."""
+    parser.add_argument("--allow-types", nargs="+", help="Resource types allowed to load (default: document script xhr fetch)")
+    parser.add_argument("--block-domains", nargs="+", default=[], help="Extra domains to block on top of the ad/tracker list")
+    parser.add_argument("--allow-domains", nargs="+", default=[], help="Only load resources from these domains")
+    parser.add_argument("--no-block", action="store_true", help="Load every resource, like a normal browser")
+
+def policy_from_args(args):
+    """Build the ResourcePolicy selected by add_policy_arguments options, or None with --no-block."""
+    if args.no_block:
+        return None
+    policy = ResourcePolicy(allowed_domains=set(args.allow_domains))
+    if args.allow_types:
+        policy.allowed_types = set(args.allow_types)
+    policy.blocked_domains.update(args.block_domains)
+    return policy
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape H2H statistics for one round of a Soccer24 league.")
+    parser.add_argument("--url", default=FIXTURES_URL, help="League fixtures page")
+    parser.add_argument("--round", default=ROUND_NAME, help='Round title as shown on the page, e.g. "Round 8"')
+    parser.add_argument("--fixtures", type=int, default=MAX_CONCURRENT_FIXTURES, help="Fixtures scraped at the same time")
+    parser.add_argument("--details", type=int, default=MAX_CONCURRENT_DETAILS, help="Reusable match-detail pages, shared by all fixtures")
+    parser.add_argument("--wait-timeout", type=int, default=WAIT_TIMEOUT_MS, help="Upper bound (ms) for each page readiness wait")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Match-detail cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Scrape every H2H match even if it is cached")
+    parser.add_argument("--incremental", action="store_true", help="Skip fixtures already saved completely; retry failed or partial ones")
+    parser.add_argument("--recent", type=int, default=0, help="Also scrape the last N matches of every team of the round")
+    parser.add_argument("--recent-dir", default=RECENT_DIR, help="Directory of the per-team recent-matches files")
+    parser.add_argument("--jsonl", action="store_true", help="Also append every fixture to one JSON Lines file of the run")
+    parser.add_argument("--dom-only", action="store_true", help="Read statistics from the rendered page instead of the site's feeds")
+    parser.add_argument("--export", help="Also export the round to one columnar dataset (.parquet or .npz)")
+    add_policy_arguments(parser)
+    add_scheduler_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    policy = policy_from_args(args)
+    sinks = metrics_from_args(args)
+    cache = None if args.no_cache else MatchCache(args.cache)
+    try:
+        asyncio.run(run(args.url, args.round, args.fixtures, args.details, cache, args.wait_timeout, policy,
+                        Checkpoint("output"), args.incremental, recent_matches=args.recent, recent_dir=args.recent_dir,
+                        scheduler=scheduler_from_args(args), jsonl=args.jsonl, feeds=not args.dom_only))
+        if args.export:
+            export_runs(["output"], args.export)
+    finally:
+        if cache:
+            cache.close()
+        finish_metrics(args, sinks)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,86 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Default location and limits of the persistent match-detail cache
+CACHE_PATH = os.path.join("cache", "match_details.sqlite3")
+MAX_ENTRIES = 5000
+MAX_AGE_DAYS = 365
+# Inserts between two evictions, so a cache kept open for long (e.g. by daemon.py) stays within its limits
+EVICT_EVERY = 100
+
+# Soccer24 match ids are 8 characters long and show up as /match/<id>/, ?mid=<id> or g_1_<id>
+MATCH_ID_PATTERN = re.compile(r"(?:/match/|[?&]mid=|\bg_\d+_)([A-Za-z0-9]{8})\b")
+
+def match_id_from_link(link: str):
+    """Extract the soccer24 match id from a match link (or onclick handler). Returns None if absent."""
+    if not link:
+        return None
+    match = MATCH_ID_PATTERN.search(link)
+    return match.group(1) if match else None
+
+class MatchCache:
+    """SQLite-backed cache of H2H match details, keyed by match id.
+
+    Finished matches never change, so an entry is only dropped when it is older
+    than max_age_days or when the cache grows past max_entries (least recently
+    used entries go first). Eviction runs when the cache is opened and then
+    every EVICT_EVERY inserts.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = MAX_ENTRIES, max_age_days: float = MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.inserts = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS match_details ("
+            "match_id TEXT PRIMARY KEY, detail TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self.evict()
+
+    def get(self, match_id: str):
+        """Return the cached detail dict for match_id, or None on a miss."""
+        if not match_id:
+            return None
+        row = self.connection.execute(
+            "SELECT detail FROM match_details WHERE match_id = ?", (match_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE match_details SET used_at = ? WHERE match_id = ?", (time.time(), match_id))
+        self.connection.commit()
+        return json.loads(row[0])
+
+    def put(self, match_id: str, detail: dict):
+        """Store the detail dict of a finished match."""
+        if not match_id:
+            return
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO match_details (match_id, detail, stored_at, used_at) VALUES (?, ?, ?, ?)",
+            (match_id, json.dumps(detail, ensure_ascii=False), now, now),
+        )
+        self.connection.commit()
+        self.inserts += 1
+        if self.inserts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop entries past max_age_days, then the least recently used ones beyond max_entries."""
+        cutoff = time.time() - self.max_age_days * 86400
+        self.connection.execute("DELETE FROM match_details WHERE stored_at < ?", (cutoff,))
+        self.connection.execute(
+            "DELETE FROM match_details WHERE match_id NOT IN "
+            "(SELECT match_id FROM match_details ORDER BY used_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,148 @@
+"""Array-backed statistics of a list of matches (H2H or recent form).
+
+The JSON files keep one dict per statistic, keyed by "match_one",
+"match_two", ..., with a [home, away] list (or [] when missing) per match.
+MatchStats holds the same data as one (n_matches, 2) array per statistic
+plus a per-match mask of the values that exist, and converts losslessly to
+and from that JSON layout.
+"""
+from dataclasses import asdict
+import numpy as np
+
+# Statistics of a match and the dtype they are stored with (float64 keeps xG values exactly as in JSON)
+STAT_DTYPES = {
+    "goals": np.int16,
+    "x_goals": np.float64,
+    "corners": np.int16,
+    "fouls": np.int16,
+    "HT_cards": np.int16,
+    "FT_cards": np.int16,
+}
+# Every per-match field of the JSON layout, in file order
+FIELDS = ("teams",) + tuple(STAT_DTYPES)
+
+ONES = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+        "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+def number_words(number: int) -> str:
+    """Spell 1..999 as in match keys, e.g. 21 -> "twenty_one", 105 -> "one_hundred_five"."""
+    words = []
+    if number >= 100:
+        words += [ONES[number // 100], "hundred"]
+        number %= 100
+    if number >= 20:
+        words.append(TENS[number // 10])
+        number %= 10
+    if number:
+        words.append(ONES[number])
+    return "_".join(words)
+
+def match_key(index: int) -> str:
+    """Key of the index-th match (1-based): "match_one", "match_two", ...; digits from 1000 on."""
+    if index < 1:
+        raise ValueError(f"Match indexes start at 1: {index}")
+    return f"match_{number_words(index) if index < 1000 else index}"
+
+# Reverse lookup of the spelled-out keys
+KEY_INDEXES = {match_key(index): index for index in range(1, 1000)}
+
+def match_index(key: str) -> int:
+    """1-based index of a match key, the inverse of match_key."""
+    if key in KEY_INDEXES:
+        return KEY_INDEXES[key]
+    suffix = key[len("match_"):]
+    if key.startswith("match_") and suffix.isdigit():
+        return int(suffix)
+    raise ValueError(f"Not a match key: {key}")
+
+class MatchStats:
+    """Teams and statistics of a growing list of matches.
+
+    teams is an (n, 2) object array of names and values[stat] an (n, 2)
+    array of STAT_DTYPES[stat]; present[field] is True for the matches that
+    have that field. Arrays are over-allocated and grow by doubling, so
+    appending a match is cheap; use len() and the [:len] slices.
+    """
+
+    __slots__ = ("size", "teams", "values", "present")
+
+    def __init__(self, capacity: int = 8):
+        self.size = 0
+        self.teams = np.empty((capacity, 2), dtype=object)
+        self.values = {stat: np.zeros((capacity, 2), dtype=dtype) for stat, dtype in STAT_DTYPES.items()}
+        self.present = {name: np.zeros(capacity, dtype=bool) for name in FIELDS}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MatchStats) and self.to_dict() == other.to_dict()
+
+    def _grow(self):
+        capacity = max(2 * len(self.teams), 1)
+
+        def grown(array):
+            copy = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            copy[:self.size] = array[:self.size]
+            return copy
+
+        self.teams = grown(self.teams)
+        self.values = {stat: grown(values) for stat, values in self.values.items()}
+        self.present = {name: grown(mask) for name, mask in self.present.items()}
+
+    def append(self, teams=None, **stats):
+        """Add a match; teams and every statistic are [home, away] lists, or empty/None when missing."""
+        if self.size == len(self.teams):
+            self._grow()
+        row = self.size
+        if teams and len(teams) == 2:
+            self.teams[row] = teams
+            self.present["teams"][row] = True
+        for stat in STAT_DTYPES:
+            value = stats.get(stat)
+            if value and len(value) == 2:
+                self.values[stat][row] = value
+                self.present[stat][row] = True
+        self.size += 1
+
+    def add_match(self, detail):
+        """Add the stats of a MatchDetail (or any object with the FIELDS attributes)."""
+        self.append(detail.teams, **{stat: getattr(detail, stat) for stat in STAT_DTYPES})
+
+    def column(self, stat: str) -> np.ma.MaskedArray:
+        """(n, 2) masked array of one statistic, masked where the match has no value."""
+        missing = ~self.present[stat][:self.size]
+        return np.ma.masked_array(self.values[stat][:self.size], mask=np.repeat(missing[:, None], 2, axis=1))
+
+    def keys(self) -> list:
+        return [match_key(index) for index in range(1, self.size + 1)]
+
+    def to_dict(self) -> dict:
+        """The JSON layout: {field: {"match_one": [home, away] or [], ...}}."""
+        keys = self.keys()
+        data = {"teams": {key: list(self.teams[row]) if self.present["teams"][row] else []
+                          for row, key in enumerate(keys)}}
+        for stat in STAT_DTYPES:
+            values, present = self.values[stat], self.present[stat]
+            data[stat] = {key: values[row].tolist() if present[row] else [] for row, key in enumerate(keys)}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Build from the JSON layout; the keys must be match_one, match_two, ... in order."""
+        keys = list(data.get("teams", {}))
+        for position, key in enumerate(keys, start=1):
+            if match_index(key) != position:
+                raise ValueError(f"Expected {match_key(position)}, found {key}")
+        stats = cls(max(len(keys), 1))
+        for key in keys:
+            stats.append(data["teams"][key], **{stat: data.get(stat, {}).get(key) for stat in STAT_DTYPES})
+        return stats
+
+def _json_dict(items) -> dict:
+    return {name: value.to_dict() if isinstance(value, MatchStats) else value for name, value in items}
+
+def as_json(data) -> dict:
+    """dataclasses.asdict that also converts MatchStats fields to their JSON layout."""
+    return asdict(data, dict_factory=_json_dict)
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# Append-only index of every file saved in an output directory (hidden, so *.json globs skip it)
+INDEX_NAME = ".index.jsonl"
+
+def league_from_url(url: str) -> str:
+    """League slug of a fixtures page URL, e.g. "premier-league"."""
+    parts = [part for part in urlsplit(url).path.split("/") if part and part != "fixtures"]
+    return parts[-1] if parts else urlsplit(url).hostname
+
+def sanitize_filename(filename: str) -> str:
+    """Remove the characters that are invalid in file names."""
+    return re.sub(r'[\\/:"*?<>|]+', "", filename)
+
+def write_text_atomic(path: str, text: str):
+    """Write text to a uniquely named temp file next to path, sync it to disk, then rename it over path.
+
+    path is never left half-written or empty, even after a crash, and concurrent writers of the
+    same path (e.g. the daemon and a main.py run) do not share a temp file.
+    """
+    directory, name = os.path.split(path)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory or ".", prefix=f".{name}.",
+                                     suffix=".tmp", delete=False) as file:
+        try:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+            # NamedTemporaryFile creates the file readable by its owner only
+            os.chmod(file.name, 0o644)
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+    os.replace(file.name, path)
+
+def write_json_atomic(path: str, data, indent: int = 4):
+    """Write data as JSON with write_text_atomic."""
+    write_text_atomic(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+class OutputWriter:
+    """Saves the results of a run to one output directory as they finish.
+
+    Every result is written to its own <name>.json file atomically and, with
+    jsonl=True, also appended as one line to the run's run-<time>.jsonl file.
+    Each save appends an entry to INDEX_NAME with the result's labels
+    (league, round, fixture, date, match ids, ...), its file and its offset in
+    the JSON Lines file, so find() can look a result up without scanning the
+    directory.
+    """
+
+    def __init__(self, output_dir: str = "output", jsonl: bool = False, league: str = None, round_name: str = None):
+        self.output_dir = output_dir
+        self.league = league
+        self.round_name = round_name
+        # Created once here rather than checked on every save
+        os.makedirs(output_dir, exist_ok=True)
+        self.index_path = os.path.join(output_dir, INDEX_NAME)
+        self.jsonl_name = None
+        self.jsonl_file = None
+        if jsonl:
+            self.jsonl_name = f"run-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.jsonl"
+
+    def write(self, data: dict, name: str, **labels) -> str:
+        """Save one result under name and index it with labels. Returns the file path."""
+        file_name = f"{sanitize_filename(name)}.json"
+        path = os.path.join(self.output_dir, file_name)
+        write_json_atomic(path, data)
+
+        offset = None
+        if self.jsonl_name:
+            if self.jsonl_file is None:
+                self.jsonl_file = open(os.path.join(self.output_dir, self.jsonl_name), "ab")
+            offset = self.jsonl_file.tell()
+            self.jsonl_file.write((json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.jsonl_file.flush()
+
+        entry = {"league": self.league, "round": self.round_name, **labels, "file": file_name,
+                 "jsonl": self.jsonl_name, "offset": offset,
+                 "saved_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        with open(self.index_path, "a", encoding="utf-8") as index:
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return path
+
+    def close(self):
+        if self.jsonl_file:
+            self.jsonl_file.close()
+            self.jsonl_file = None
+
+def read_index(output_dir: str) -> list:
+    """Index entries of an output directory, the latest one per file."""
+    path = os.path.join(output_dir, INDEX_NAME)
+    if not os.path.exists(path):
+        return []
+    latest = {}
+    with open(path, encoding="utf-8") as index:
+        for line in index:
+            if line.strip():
+                entry = json.loads(line)
+                latest[entry["file"]] = entry
+    return list(latest.values())
+
+def find(output_dir: str, league: str = None, round_name: str = None, fixture: str = None, date: str = None,
+         match_id: str = None) -> list:
+    """Index entries matching every given label (match_id: one of the result's match ids)."""
+    wanted = {"league": league, "round": round_name, "fixture": fixture, "date": date}
+    return [
+        entry for entry in read_index(output_dir)
+        if all(value is None or entry.get(label) == value for label, value in wanted.items())
+        and (match_id is None or match_id in (entry.get("match_ids") or []))
+    ]
+
+def load(output_dir: str, entry: dict) -> dict:
+    """Data of an index entry: one seek into the JSON Lines file when there is one, else its own file."""
+    if entry.get("jsonl") and entry.get("offset") is not None:
+        with open(os.path.join(output_dir, entry["jsonl"]), "rb") as file:
+            file.seek(entry["offset"])
+            return json.loads(file.readline())
+    with open(os.path.join(output_dir, entry["file"]), encoding="utf-8") as file:
+        return json.load(file)
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up saved fixtures in an output directory's index.")
+    parser.add_argument("output_dir", help="Output directory, e.g. output or Prem_8")
+    parser.add_argument("--league", help='League slug, e.g. "premier-league"')
+    parser.add_argument("--round", help='Round title, e.g. "Round 8"')
+    parser.add_argument("--fixture", help='Fixture, e.g. "Liverpool vs Chelsea"')
+    parser.add_argument("--date", help="Fixture start time as shown on the match page")
+    parser.add_argument("--match-id", help="Match id of one of the fixture's H2H matches")
+    parser.add_argument("--data", action="store_true", help="Print the saved data instead of the index entries")
+    args = parser.parse_args()
+
+    for entry in find(args.output_dir, args.league, args.round, args.fixture, args.date, args.match_id):
+        print(json.dumps(load(args.output_dir, entry) if args.data else entry, indent=4, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
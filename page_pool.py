@@ -0,0 +1,40 @@
+import asyncio
+
+class PagePool:
+    """Fixed-size pool of reusable pages in one browser context.
+
+    At most size pages are in use at a time. acquire() hands out an idle page
+    or opens a new one, so pages are navigated from match to match instead of
+    being opened and closed each time.
+    """
+
+    def __init__(self, context, size: int):
+        self.context = context
+        self.size = size
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+
+    async def acquire(self):
+        """Return a page for exclusive use until release()."""
+        await self.slots.acquire()
+        try:
+            while self.idle:
+                page = self.idle.pop()
+                if not page.is_closed():
+                    return page
+            return await self.context.new_page()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    async def warm(self):
+        """Open every page of the pool ahead of time, so the first matches do not wait for new_page()."""
+        while len(self.idle) < self.size:
+            self.idle.append(await self.context.new_page())
+
+    def release(self, page):
+        """Give a page back to the pool; a closed or crashed page is dropped and replaced on demand."""
+        if not page.is_closed():
+            self.idle.append(page)
+        self.slots.release()
+
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit, urlunsplit
+from main import FIXTURES_URL, ROUND_NAME, add_policy_arguments, policy_from_args, run
+
+# Headers describing the original transfer rather than the stored, already decoded body
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+def request_key(method: str, url: str, post_data: bytes = None, with_query: bool = True) -> str:
+    """Key a request is stored under: method and URL without fragment (and optionally without query), plus a POST body hash."""
+    parts = urlsplit(url)
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query if with_query else "", ""))
+    key = f"{method} {url}"
+    if post_data:
+        key += " " + hashlib.sha1(post_data).hexdigest()
+    return key
+
+class Recording:
+    """A directory of captured responses.
+
+    index.json maps request keys to status, headers and body file, bodies/
+    holds the (deduplicated) response bodies, and expected/ the fixture files
+    the recorded run saved, to compare replayed runs against.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = os.path.join(path, "index.json")
+        self.bodies_dir = os.path.join(path, "bodies")
+        self.expected_dir = os.path.join(path, "expected")
+        self.meta = {}
+        self.responses = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as file:
+                data = json.load(file)
+            self.meta = data["meta"]
+            self.responses = data["responses"]
+        # Fallback lookup for URLs whose query string changes between runs (e.g. cache busters)
+        self.loose = {entry["loose_key"]: key for key, entry in self.responses.items()}
+
+    def add(self, method: str, url: str, post_data: bytes, status: int, headers: dict, body: bytes):
+        """Store one response."""
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        body_name = hashlib.sha1(body).hexdigest()
+        body_path = os.path.join(self.bodies_dir, body_name)
+        if not os.path.exists(body_path):
+            with open(body_path, "wb") as file:
+                file.write(body)
+        key = request_key(method, url, post_data)
+        loose_key = request_key(method, url, post_data, with_query=False)
+        self.responses[key] = {
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            "body": body_name,
+            "loose_key": loose_key,
+        }
+        self.loose[loose_key] = key
+
+    def find(self, method: str, url: str, post_data: bytes = None):
+        """Return the stored entry for a request, or None."""
+        key = request_key(method, url, post_data)
+        if key not in self.responses:
+            key = self.loose.get(request_key(method, url, post_data, with_query=False))
+        return self.responses.get(key)
+
+    def body(self, entry: dict) -> bytes:
+        with open(os.path.join(self.bodies_dir, entry["body"]), "rb") as file:
+            return file.read()
+
+    def save(self):
+        """Write index.json."""
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as file:
+            json.dump({"meta": self.meta, "responses": self.responses}, file, indent=4, ensure_ascii=False)
+
+class Recorder:
+    """Route handler that lets every request hit the network and stores its response in a Recording."""
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+
+    async def install(self, target):
+        async def handle(route):
+            request = route.request
+            try:
+                response = await route.fetch()
+                body = await response.body()
+            except Exception:
+                await route.abort()
+                return
+            self.recording.add(request.method, request.url, request.post_data_buffer,
+                               response.status, response.headers, body)
+            await route.fulfill(response=response, body=body)
+
+        await target.route("**/*", handle)
+
+class Replayer:
+    """Route handler that serves every request from a Recording and aborts the ones it does not have."""
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.served = 0
+        self.missed = 0
+
+    async def install(self, target):
+        async def handle(route):
+            request = route.request
+            entry = self.recording.find(request.method, request.url, request.post_data_buffer)
+            if entry is None:
+                self.missed += 1
+                await route.abort()
+                return
+            self.served += 1
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=self.recording.body(entry))
+
+        await target.route("**/*", handle)
+
+async def record(path: str, fixtures_url: str, round_name: str, policy=None, feeds: bool = True):
+    """Scrape a round live while storing every response (and the saved fixture files) under path.
+
+    With feeds=False the fixture files are read from the rendered pages, so `feeds.py --check`
+    can compare the recorded statistics feeds against them.
+    """
+    recording = Recording(path)
+    recording.meta = {"fixtures_url": fixtures_url, "round": round_name}
+    try:
+        # No cache, so every match detail is loaded and recorded
+        results = await run(fixtures_url, round_name, cache=None, policy=policy,
+                            output_dir=recording.expected_dir, recording=Recorder(recording), feeds=feeds)
+    finally:
+        recording.save()
+    print(f"Recorded {len(recording.responses)} responses and {len(results)} fixtures to {path}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a round of Soccer24 pages for offline replay (see benchmark.py).")
+    parser.add_argument("path", help="Recording directory, e.g. recordings/prem_8")
+    parser.add_argument("--url", default=FIXTURES_URL, help="League fixtures page")
+    parser.add_argument("--round", default=ROUND_NAME, help='Round title as shown on the page, e.g. "Round 8"')
+    parser.add_argument("--dom-only", action="store_true", help="Save the fixture files from the rendered pages (for feeds.py --check)")
+    add_policy_arguments(parser)
+    args = parser.parse_args()
+
+    asyncio.run(record(args.path, args.url, args.round, policy_from_args(args), not args.dom_only))
+
+if __name__ == "__main__":
+    main()
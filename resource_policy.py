@@ -0,0 +1,92 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+# Resource types the scraper needs: the page itself, its feeds and the scripts that render it
+ALLOWED_RESOURCE_TYPES = {"document", "script", "xhr", "fetch"}
+
+# Ad, analytics and tracker domains (subdomains included); nothing from these is needed to read the DOM
+BLOCKED_DOMAINS = {
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagservices.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "rubiconproject.com",
+    "pubmatic.com",
+    "openx.net",
+    "casalemedia.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "facebook.net",
+    "hotjar.com",
+    "cookielaw.org",
+    "onetrust.com",
+    "didomi.io",
+}
+
+def _matches_domain(host: str, domains) -> bool:
+    """True if host is one of domains or a subdomain of one."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+@dataclass
+class ResourcePolicy:
+    """Decides which requests a browser context may make.
+
+    A request is allowed when its resource type is in allowed_types, its host is
+    not in blocked_domains and, if allowed_domains is set, its host is in
+    allowed_domains. Ad iframes are documents too, so sub-frame documents are
+    blocked unless block_subframes is False.
+    """
+    allowed_types: set = field(default_factory=lambda: set(ALLOWED_RESOURCE_TYPES))
+    blocked_domains: set = field(default_factory=lambda: set(BLOCKED_DOMAINS))
+    allowed_domains: set = field(default_factory=set)
+    block_subframes: bool = True
+    # Number of aborted requests by resource type
+    blocked: Counter = field(default_factory=Counter)
+
+    def allows(self, resource_type: str, url: str, subframe: bool = False) -> bool:
+        """Return True if a request of resource_type to url may go through."""
+        if url.startswith(("data:", "blob:")):
+            return True
+        if resource_type not in self.allowed_types:
+            return False
+        if subframe and self.block_subframes:
+            return False
+        host = urlsplit(url).hostname or ""
+        if _matches_domain(host, self.blocked_domains):
+            return False
+        if self.allowed_domains and not _matches_domain(host, self.allowed_domains):
+            return False
+        return True
+
+    async def install(self, target):
+        """Route every request of a BrowserContext or Page through this policy."""
+        async def handle(route):
+            request = route.request
+            try:
+                subframe = request.resource_type == "document" and request.frame.parent_frame is not None
+            except Exception:
+                subframe = False  # Service worker requests have no frame
+            if self.allows(request.resource_type, request.url, subframe):
+                # Let earlier route handlers (e.g. a replay recording) see the request, else continue it
+                await route.fallback()
+            else:
+                self.blocked[request.resource_type] += 1
+                await route.abort()
+
+        await target.route("**/*", handle)
+
+    def summary(self) -> str:
+        """One line with the number of blocked requests per resource type."""
+        if not self.blocked:
+            return "Blocked 0 requests."
+        details = ", ".join(f"{resource_type}={count}" for resource_type, count in self.blocked.most_common())
+        return f"Blocked {sum(self.blocked.values())} requests ({details})."
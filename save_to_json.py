@@ -1,17 +1,11 @@
-from dataclasses import asdict, dataclass, field
-import json
+from dataclasses import dataclass, field
 import os
+from match_stats import MatchStats, as_json
+from output_writer import sanitize_filename, write_json_atomic
 
-@dataclass
-class RecentMatches:
+class RecentMatches(MatchStats):
     """Holds RecentMatches data"""
-    teams: dict = field(default_factory=dict)
-    goals: dict = field(default_factory=dict)
-    x_goals: dict = field(default_factory=dict)
-    corners: dict = field(default_factory=dict)
-    fouls: dict = field(default_factory=dict)
-    HT_cards: dict = field(default_factory=dict)
-    FT_cards: dict = field(default_factory=dict)
+    __slots__ = ()
 
 @dataclass
 class HomeTeam:
@@ -24,19 +18,19 @@ class DataStructure:
     """Holds Home Team data"""
     home_team: HomeTeam = field(default_factory=HomeTeam)
 
-def save_to_json(data: DataStructure, filename: str):
-    """Save data as json file"""
-    if not os.path.exists("output"):
-        os.makedirs("output")
-    with open(f"output/{filename}.json", "w") as file:
-        json.dump(asdict(data), file, indent=4)
+def save_to_json(data: DataStructure, filename: str, output_dir: str = "output") -> str:
+    """Save data as json file with sanitized filename (written atomically). Returns the file path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{sanitize_filename(filename)}.json")
+    write_json_atomic(path, as_json(data))
+    return path
 
 def main():
     # Sample structured data to demonstrate the format
     data = DataStructure(
         home_team=HomeTeam(
             name="Stuttgart",
-            recent_matches=RecentMatches(
+            recent_matches=RecentMatches.from_dict(dict(
                 teams={
                     "match_one": ["Stuttgart", "Mainz"],
                     "match_two": ["Freiburg", "Stuttgart"],
@@ -100,7 +94,7 @@ def main():
                     "match_six": [1,2],
                     "match_seven": [4,3]
                 }
-            )
+            ))
         )
     )
 
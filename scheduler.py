@@ -0,0 +1,166 @@
+import asyncio
+import random
+import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from instrumentation import METRICS
+
+# Default navigation rate (per second) and burst of the token bucket
+NAVIGATION_RATE = 5.0
+NAVIGATION_BURST = 10
+# Bounds of the adaptive number of navigations in flight
+MAX_NAVIGATIONS = 12
+MIN_NAVIGATIONS = 1
+# Retries of a failed navigation, and the backoff before them (seconds, doubled on every retry, jittered)
+NAVIGATION_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# Upper bound (ms) of one navigation attempt, and the duration (ms) counted as a slow response
+GOTO_TIMEOUT_MS = 60000
+SLOW_RESPONSE_MS = 10000
+
+# Response statuses that mean the site wants us to slow down
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+class NavigationError(Exception):
+    """A navigation answered 429 or 5xx (raised once every retry of it did)."""
+
+    def __init__(self, message: str, status: int = None, retry_after: str = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Allows rate acquisitions per second on average, with bursts of up to capacity."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class NavigationScheduler:
+    """Rate limit, adaptive concurrency and retries for every page navigation.
+
+    Each attempt takes a token from the bucket and a navigation slot. The
+    number of slots follows AIMD: it grows by one per `limit` healthy
+    responses and is halved on a 429/5xx answer, a timeout or a slow
+    response. It is halved once per congestion window: signals from attempts
+    started before the last decrease are ignored, so a burst of slow
+    responses counts once. Failed attempts are retried after a jittered
+    exponential backoff (or the server's Retry-After).
+    """
+
+    def __init__(self, rate: float = NAVIGATION_RATE, burst: int = NAVIGATION_BURST,
+                 max_concurrency: int = MAX_NAVIGATIONS, min_concurrency: int = MIN_NAVIGATIONS,
+                 retries: int = NAVIGATION_RETRIES, goto_timeout: float = GOTO_TIMEOUT_MS,
+                 slow_response: float = SLOW_RESPONSE_MS):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(max_concurrency)
+        # Number of decreases so far; an attempt remembers it when it starts
+        self.epoch = 0
+        self.in_flight = 0
+        self.slots = asyncio.Condition()
+        self.retries = retries
+        self.goto_timeout = goto_timeout
+        self.slow_response = slow_response
+
+    def backoff(self, attempt: int) -> float:
+        """Delay (s) before retry number attempt (1-based): full jitter over an exponentially growing cap."""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    def healthy(self):
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def congested(self, reason: str, epoch: int):
+        """Halve the limit, unless the attempt that saw the congestion started before the last decrease."""
+        METRICS.count("congestion", reason=reason)
+        if epoch != self.epoch:
+            return
+        self.epoch += 1
+        old_limit = int(self.limit)
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        if int(self.limit) != old_limit:
+            print(f"[scheduler] {reason}: navigations in flight {old_limit} -> {int(self.limit)}")
+
+    async def _acquire_slot(self):
+        async with self.slots:
+            await self.slots.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def _release_slot(self):
+        async with self.slots:
+            self.in_flight -= 1
+            self.slots.notify_all()
+
+    async def _navigate(self, page, url: str, **kwargs):
+        """page.goto(url), raising NavigationError for a 429/5xx answer so it is timed as an error."""
+        response = await page.goto(url, **kwargs)
+        if response is not None and response.status in THROTTLE_STATUSES:
+            raise NavigationError(f"{response.status} for {url}", response.status, response.headers.get("retry-after"))
+        return response
+
+    async def goto(self, page, url: str, label: str = "goto", **kwargs):
+        """page.goto(url) under the rate limit and concurrency limit, retried on timeouts, errors and 429/5xx."""
+        kwargs.setdefault("timeout", self.goto_timeout)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                METRICS.count("retries", label=label)
+            await self.bucket.acquire()
+            await self._acquire_slot()
+            retry_after = None
+            epoch = self.epoch
+            start = time.perf_counter()
+            try:
+                response = await METRICS.timed(label, self._navigate(page, url, **kwargs), url=url)
+            except PlaywrightTimeoutError as e:
+                error = e
+                self.congested("timeout", epoch)
+            except NavigationError as e:
+                error = e
+                retry_after = e.retry_after
+                self.congested(f"status {e.status}", epoch)
+            except Exception as e:
+                error = e
+            else:
+                if (time.perf_counter() - start) * 1000 > self.slow_response:
+                    self.congested("slow response", epoch)
+                else:
+                    self.healthy()
+                return response
+            finally:
+                await self._release_slot()
+
+            if attempt == self.retries:
+                break
+            delay = self.backoff(attempt + 1)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"Navigation to {url} failed ({error}); retry {attempt + 1}/{self.retries} in {delay:.1f} s")
+            await asyncio.sleep(delay)
+        raise error
+
+def add_scheduler_arguments(parser):
+    """Add the navigation rate limit and retry options to a command line parser."""
+    parser.add_argument("--rate", type=float, default=NAVIGATION_RATE, help="Page navigations per second (token bucket rate)")
+    parser.add_argument("--max-navigations", type=int, default=MAX_NAVIGATIONS, help="Upper bound of the adaptive number of navigations in flight")
+    parser.add_argument("--retries", type=int, default=NAVIGATION_RETRIES, help="Retries of a failed navigation or fixture")
+    parser.add_argument("--goto-timeout", type=int, default=GOTO_TIMEOUT_MS, help="Upper bound (ms) of one navigation attempt")
+
+def scheduler_from_args(args) -> NavigationScheduler:
+    """Build the NavigationScheduler selected by add_scheduler_arguments options."""
+    return NavigationScheduler(rate=args.rate, burst=max(1, int(2 * args.rate)), max_concurrency=args.max_navigations,
+                               retries=args.retries, goto_timeout=args.goto_timeout)